@@ -1,15 +1,87 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 import openai
 
-def ai_summarize_code(file_path: Path, api_key: str, model: str = 'gpt-3.5-turbo') -> Optional[str]:
-    content = file_path.read_text(encoding='utf-8', errors='ignore')
-    openai.api_key = api_key
-    response = openai.ChatCompletion.create(
-        model=model,
-        messages=[
-            {'role': 'system', 'content': 'You are a code summarizer.'},
-            {'role': 'user', 'content': f'Summarize this code in a concise, professional way (max 10 lines):\n{content}'}
-        ]
-    )
-    return response['choices'][0]['message']['content'] 
\ No newline at end of file
+SYSTEM_PROMPT = 'You are a code summarizer.'
+USER_PROMPT = 'Summarize this code in a concise, professional way (max 10 lines):\n{content}'
+CACHE_PATH = Path.home() / '.cache' / 'smartrepo' / 'ai_summaries.json'
+# أقصى عدد من الملخصات المحفوظة؛ عند التجاوز تُحذف الأقدم استخدامًا
+CACHE_MAX_ENTRIES = 2000
+
+def _load_cache() -> Dict[str, str]:
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache: Dict[str, str]):
+    # ترتيب القاموس هو ترتيب الاستخدام (الأحدث في النهاية)، فيُحتفظ بآخر CACHE_MAX_ENTRIES فقط
+    if len(cache) > CACHE_MAX_ENTRIES:
+        cache = dict(list(cache.items())[-CACHE_MAX_ENTRIES:])
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_PATH.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp, CACHE_PATH)
+    except OSError:
+        pass
+
+def _prompt_digest(model: str) -> str:
+    # تغيير النموذج أو نص التعليمات يُبطل الملخصات المحفوظة سابقًا
+    return hashlib.blake2b(f"{model}\0{SYSTEM_PROMPT}\0{USER_PROMPT}".encode('utf-8'), digest_size=16).hexdigest()
+
+async def _summarize_all(files: List[Path], api_key: str, model: str, concurrency: int,
+                         use_cache: bool) -> Dict[str, Optional[str]]:
+    cache = _load_cache() if use_cache else {}
+    prefix = _prompt_digest(model)
+    client = openai.AsyncOpenAI(api_key=api_key)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(file: Path) -> Optional[str]:
+        content = file.read_bytes()
+        key = f"{prefix}:{hashlib.blake2b(content).hexdigest()}"
+        if key in cache:
+            # نقل المدخل إلى النهاية ليُعد مستخدمًا حديثًا
+            cache[key] = cache.pop(key)
+            return cache[key]
+        async with sem:
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {'role': 'system', 'content': SYSTEM_PROMPT},
+                        {'role': 'user', 'content': USER_PROMPT.format(content=content.decode('utf-8', errors='ignore'))}
+                    ]
+                )
+            except openai.OpenAIError:
+                return None
+        summary = response.choices[0].message.content
+        cache[key] = summary
+        return summary
+
+    try:
+        summaries = await asyncio.gather(*(one(file) for file in files))
+    finally:
+        await client.close()
+    if use_cache:
+        _save_cache(cache)
+    return {str(file): summary for file, summary in zip(files, summaries)}
+
+def ai_summarize_code_batch(files: List[Path], api_key: str, model: str = 'gpt-3.5-turbo',
+                            concurrency: int = 16, use_cache: bool = True) -> Dict[str, Optional[str]]:
+    """
+    تلخيص عدة ملفات بطلبات متزامنة (بحد أقصى concurrency طلبًا في نفس الوقت) مع تخزين الملخصات حسب محتوى الملف
+    use_cache=False: لا يُقرأ ملف CACHE_PATH ولا يُكتب
+    """
+    return asyncio.run(_summarize_all(files, api_key, model, concurrency, use_cache))
+
+def ai_summarize_code(file_path: Path, api_key: str, model: str = 'gpt-3.5-turbo',
+                      use_cache: bool = True) -> Optional[str]:
+    return ai_summarize_code_batch([file_path], api_key, model, use_cache=use_cache)[str(file_path)]
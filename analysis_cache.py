@@ -0,0 +1,83 @@
+import ast
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# حدود عدد المداخل: المفتاح يتضمن st_mtime_ns والحجم، فكل تعديل على ملف يضيف مدخلًا جديدًا،
+# وبدون حد تتراكم النسخ القديمة في العمليات الطويلة (مثل الواجهة الرسومية). شجرة AST أثقل من نصها بكثير
+SOURCE_CACHE_SIZE = 4096
+AST_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=SOURCE_CACHE_SIZE)
+def _read_source(path: str, mtime_ns: int, size: int) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def _parse_source(path: str, mtime_ns: int, size: int) -> Optional[ast.AST]:
+    try:
+        return ast.parse(_read_source(path, mtime_ns, size), filename=path)
+    except (SyntaxError, ValueError):
+        return None
+
+def _cache_key(path: Path):
+    st = os.stat(path)
+    return str(path), st.st_mtime_ns, st.st_size
+
+def get_source(path: Path) -> bytes:
+    """
+    قراءة محتوى الملف مرة واحدة وإعادة استخدامه ما دام الملف لم يتغير (حسب st_mtime_ns والحجم)
+    """
+    return _read_source(*_cache_key(path))
+
+def get_ast(path: Path) -> Optional[ast.AST]:
+    """
+    إرجاع شجرة AST المخزنة للملف، أو None إذا تعذرت قراءته أو تحليله
+    """
+    try:
+        return _parse_source(*_cache_key(path))
+    except OSError:
+        return None
+
+def parse_source(source: bytes, path: Path) -> Optional[ast.AST]:
+    try:
+        return ast.parse(source, filename=str(path))
+    except (SyntaxError, ValueError):
+        return None
+
+def _read_bytes(path: Path, max_bytes: Optional[int] = None) -> Optional[bytes]:
+    try:
+        with open(path, 'rb') as f:
+            if max_bytes is not None and os.fstat(f.fileno()).st_size > max_bytes:
+                return None
+            return f.read()
+    except OSError:
+        return None
+
+@dataclass
+class Corpus:
+    """
+    محتوى ملفات المشروع مقروءًا مرة واحدة ليُشارك بين كل مراحل التحليل التي تعمل داخل العملية
+    """
+    files: Dict[Path, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, paths: List[Path], max_workers: int = 8, max_bytes: Optional[int] = None) -> 'Corpus':
+        """
+        max_bytes: الملفات الأكبر من هذا الحجم لا تُقرأ ولا تدخل في المحتوى
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            contents = list(ex.map(functools.partial(_read_bytes, max_bytes=max_bytes), paths))
+        return cls({path: data for path, data in zip(paths, contents) if data is not None})
+
+    def source(self, path: Path) -> Optional[bytes]:
+        return self.files.get(path)
+
+    def py_files(self) -> List[Path]:
+        return [path for path in self.files if path.suffix == '.py']
+
+    def text_files(self) -> List[Path]:
+        return list(self.files)
@@ -0,0 +1,75 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 32
+
+# عدد المعالجات المتاحة لمجمعات العمليات الداخلية؛ None يعني كل المعالجات
+_process_workers: Optional[int] = None
+
+def set_process_workers(count: Optional[int]):
+    """
+    تحديد عدد عمليات كل مجمع داخلي، مثلًا عند تحليل عدة مشاريع فرعية بالتوازي حتى لا يصبح العدد مربع عدد المعالجات
+    """
+    global _process_workers
+    _process_workers = count
+
+def process_workers() -> Optional[int]:
+    return _process_workers
+
+def use_process_pool(item_count: int, min_items: int) -> bool:
+    """
+    هل يستحق العمل مجمع عمليات: عدد العناصر كافٍ، ولم يُفرض التنفيذ التسلسلي بـ set_process_workers(1)
+    """
+    return item_count >= min_items and _process_workers != 1
+
+def _cpu_count() -> int:
+    return _process_workers or os.cpu_count() or 1
+
+def _arg_max() -> int:
+    try:
+        arg_max = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError, OSError):
+        arg_max = -1
+    if arg_max <= 0:
+        arg_max = 32000  # حد سطر الأوامر في Windows
+    # نترك نصف المساحة لمتغيرات البيئة وبقية الوسائط
+    return arg_max // 2
+
+def chunk_files(files: Sequence[Path], batch: int = DEFAULT_BATCH_SIZE) -> List[List[Path]]:
+    """
+    تقسيم الملفات إلى دفعات لا تتجاوز batch ملفًا ولا حد طول سطر الأوامر
+    """
+    limit = _arg_max()
+    chunks = []
+    current = []
+    current_len = 0
+    for file in files:
+        arg_len = len(os.fsencode(str(file))) + 1
+        if current and (len(current) >= batch or current_len + arg_len > limit):
+            chunks.append(current)
+            current = []
+            current_len = 0
+        current.append(file)
+        current_len += arg_len
+    if current:
+        chunks.append(current)
+    return chunks
+
+def run_batched(cmd_prefix: Sequence[str], files: Sequence[Path], cmd_suffix: Sequence[str] = (),
+                batch: int = DEFAULT_BATCH_SIZE, text: bool = True) -> List[Tuple[List[Path], subprocess.CompletedProcess]]:
+    """
+    تشغيل أداة خارجية على دفعات من الملفات بالتوازي وإرجاع (الدفعة، نتيجة التشغيل) لكل دفعة
+    """
+    chunks = chunk_files(files, batch)
+    if not chunks:
+        return []
+
+    def run_chunk(chunk: List[Path]) -> subprocess.CompletedProcess:
+        return subprocess.run([*cmd_prefix, *map(str, chunk), *cmd_suffix], capture_output=True, text=text)
+
+    max_workers = min(len(chunks), _cpu_count() * 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(zip(chunks, ex.map(run_chunk, chunks)))
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+CACHE_DB = '.smartrepo-cache.db'
+# ثوانٍ ينتظرها الاتصال إذا كانت قاعدة البيانات مقفلة من عملية أخرى (مثل تحليل مشروع فرعي آخر)
+CACHE_BUSY_TIMEOUT = 30
+
+# بيانات stat لكل ملف أثناء تحليل واحد (انظر stat_snapshot)، وNone خارج التحليل
+_stat_snapshot: Optional[Dict[Path, Tuple[str, int, int]]] = None
+
+@contextmanager
+def stat_snapshot() -> Iterator[None]:
+    """
+    داخل هذا السياق يُستدعى stat مرة واحدة لكل ملف وتُستخدم نتيجته لكل الأدوات ولكل get وput،
+    بدل استدعائه من جديد عند كل قراءة أو كتابة في الذاكرة المؤقتة. المفتاح المحفوظ يكون من قبل
+    التحليل، فإذا تغير الملف أثناءه لا تُربط النتيجة القديمة بالنسخة الجديدة
+    """
+    global _stat_snapshot
+    if _stat_snapshot is not None:
+        yield
+        return
+    _stat_snapshot = {}
+    try:
+        yield
+    finally:
+        _stat_snapshot = None
+
+class Cache:
+    """
+    تخزين نتائج التحليل لكل ملف في sqlite، والمفتاح (المسار، الأداة، st_mtime_ns، الحجم)
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'path TEXT, tool TEXT, mtime_ns INTEGER, size INTEGER, result TEXT, '
+            'PRIMARY KEY (path, tool))'
+        )
+
+    @staticmethod
+    def _stat(path: Path):
+        snapshot = _stat_snapshot
+        if snapshot is not None:
+            key = snapshot.get(path)
+            if key is not None:
+                return key
+        st = os.stat(path)
+        key = os.path.abspath(path), st.st_mtime_ns, st.st_size
+        if snapshot is not None:
+            snapshot[path] = key
+        return key
+
+    def get(self, path: Path, tool: str) -> Optional[Any]:
+        try:
+            abs_path, mtime_ns, size = self._stat(path)
+        except OSError:
+            return None
+        try:
+            row = self.conn.execute(
+                'SELECT result FROM results WHERE path = ? AND tool = ? AND mtime_ns = ? AND size = ?',
+                (abs_path, tool, mtime_ns, size)
+            ).fetchone()
+        except sqlite3.OperationalError:  # قاعدة البيانات مقفلة من عملية أخرى: نعامل الملف كغير مخزن
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, path: Path, tool: str, result: Any, commit: bool = True):
+        try:
+            abs_path, mtime_ns, size = self._stat(path)
+        except OSError:
+            return
+        try:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO results (path, tool, mtime_ns, size, result) VALUES (?, ?, ?, ?, ?)',
+                (abs_path, tool, mtime_ns, size, json.dumps(result, ensure_ascii=False))
+            )
+        except sqlite3.OperationalError:
+            return  # التخزين المؤقت اختياري، فالفشل في الكتابة لا يوقف التحليل
+        if commit:
+            self.commit()
+
+    def commit(self):
+        """
+        إنهاء معاملة الكتابة المفتوحة، والتراجع عنها إذا تعذر الحفظ حتى لا يبقى القفل محجوزًا
+        """
+        try:
+            self.conn.commit()
+        except sqlite3.OperationalError:
+            self.conn.rollback()
+
+_cache = None
+
+def get_cache() -> Optional[Cache]:
+    global _cache
+    if _cache is None:
+        try:
+            _cache = Cache(sqlite3.connect(CACHE_DB, timeout=CACHE_BUSY_TIMEOUT, check_same_thread=False))
+        except sqlite3.Error:
+            return None
+    return _cache
+
+def reset_cache():
+    """
+    ترك الاتصال الحالي (الموروث من العملية الأم عند fork) لتفتح العملية اتصالها الخاص عند أول استخدام
+    """
+    global _cache
+    _cache = None
+
+def tool_version(dist: str) -> str:
+    try:
+        return f"{dist}=={metadata.version(dist)}"
+    except metadata.PackageNotFoundError:
+        return f"{dist}==unknown"
+
+def python_tool(name: str) -> str:
+    """
+    اسم أداة داخلية مرتبط بإصدار بايثون، لأن شجرة AST تختلف بين الإصدارات
+    """
+    return f"{name}@py{sys.version_info[0]}.{sys.version_info[1]}"
+
+def run_cached(tool: str, files: List[Path], compute: Callable[[List[Path]], Dict[str, Any]],
+               should_cache: Callable[[Any], bool] = lambda result: True) -> Dict[str, Any]:
+    """
+    إرجاع نتائج الملفات غير المتغيرة من الذاكرة المؤقتة وتشغيل compute على بقية الملفات فقط
+    """
+    cache = get_cache()
+    if cache is None:
+        return compute(files)
+    results = {}
+    missing = []
+    for file in files:
+        hit = cache.get(file, tool)
+        if hit is None:
+            missing.append(file)
+        else:
+            results[str(file)] = hit
+    if missing:
+        computed = compute(missing)
+        for file in missing:
+            key = str(file)
+            if key in computed and should_cache(computed[key]):
+                cache.put(file, tool, computed[key], commit=False)
+        cache.commit()
+        results.update(computed)
+    return {str(file): results[str(file)] for file in files if str(file) in results}
@@ -1,44 +1,110 @@
 import ast
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set
+from itertools import islice
+from typing import List, Dict, Optional, Set, Tuple, Union
 import networkx as nx
+from analysis_cache import Corpus, get_ast, parse_source
+from cache_support import run_cached, python_tool
+from batch_support import process_workers, use_process_pool
 
-def extract_call_graph(py_files: List[Path]) -> Dict[str, Set[str]]:
+class _CallCollector(ast.NodeVisitor):
+    def __init__(self, prefix: str, call_graph: Dict[str, Set[str]]):
+        self.prefix = prefix
+        self.call_graph = call_graph
+        self.stack: List[Set[str]] = []
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        calls = set()
+        self.call_graph[f"{self.prefix}:{node.name}"] = calls
+        self.stack.append(calls)
+        self.generic_visit(node)
+        self.stack.pop()
+
+    def visit_Call(self, node: ast.Call):
+        if self.stack and isinstance(node.func, ast.Name):
+            # الاستدعاء داخل دالة متداخلة يُحسب للدوال المحيطة بها أيضًا
+            for calls in self.stack:
+                calls.add(node.func.id)
+        self.generic_visit(node)
+
+# إنشاء مجموعة عمليات مكلف، لذلك لا نستخدمها إلا للمشاريع الكبيرة
+PARALLEL_MIN_FILES = 64
+
+def _parse_one_file(item: Tuple[Path, Optional[bytes]]) -> Dict[str, List[str]]:
+    file, source = item
+    call_graph = {}
+    tree = get_ast(file) if source is None else parse_source(source, file)
+    if tree is not None:
+        _CallCollector(file.name, call_graph).visit(tree)
+    # قوائم بدل المجموعات حتى تُحفظ النتيجة في الذاكرة المؤقتة كـ JSON
+    return {func: sorted(calls) for func, calls in call_graph.items()}
+
+def _parse_files(py_files: List[Path], sources: Dict[Path, bytes]) -> Dict[str, Dict[str, List[str]]]:
+    items = [(file, sources.get(file)) for file in py_files]
+    if not use_process_pool(len(items), PARALLEL_MIN_FILES):
+        return {str(file): _parse_one_file(item) for file, item in zip(py_files, items)}
+    with ProcessPoolExecutor(max_workers=process_workers()) as ex:
+        return {str(file): graph for file, graph in zip(py_files, ex.map(_parse_one_file, items, chunksize=16))}
+
+def extract_call_graph(py_files: Union[List[Path], Corpus]) -> Dict[str, Set[str]]:
     """
     استخراج call graph: دالة -> الدوال التي تستدعيها
     """
+    sources = {}
+    if isinstance(py_files, Corpus):
+        sources = py_files.files
+        py_files = py_files.py_files()
     call_graph = {}
-    for file in py_files:
-        try:
-            tree = ast.parse(file.read_text(encoding='utf-8'))
-            funcs = {n.name: n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)}
-            for func_name, func_node in funcs.items():
-                calls = set()
-                for node in ast.walk(func_node):
-                    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                        calls.add(node.func.id)
-                call_graph[f"{file.name}:{func_name}"] = calls
-        except Exception:
-            continue
+    results = run_cached(python_tool('callgraph'), py_files, lambda files: _parse_files(files, sources))
+    for file_graph in results.values():
+        for func, calls in file_graph.items():
+            call_graph[func] = set(calls)
     return call_graph
 
 def call_graph_to_mermaid(call_graph: Dict[str, Set[str]]) -> str:
     lines = ["graph TD"]
     for src, tgts in call_graph.items():
-        src_node = src.replace(":", "_")
+        src_label = f"{src.replace(':', '_')}['{src}']"
         if not tgts:
-            lines.append(f"    {src_node}['{src}']")
-        for tgt in tgts:
-            tgt_node = tgt.replace(":", "_")
-            lines.append(f"    {src_node}['{src}'] --> {tgt_node}['{tgt}']")
+            lines.append(f"    {src_label}")
+            continue
+        lines.extend(f"    {src_label} --> {tgt.replace(':', '_')}['{tgt}']" for tgt in tgts)
     return '\n'.join(lines)
 
-def find_cycles(call_graph: Dict[str, Set[str]]) -> List[List[str]]:
+# الحد الافتراضي لعدد الدورات في all_cycles
+MAX_CYCLES = 1000
+
+def _build_graph(call_graph: Dict[str, Set[str]]) -> nx.DiGraph:
     G = nx.DiGraph()
-    for src, tgts in call_graph.items():
-        for tgt in tgts:
-            G.add_edge(src, tgt)
-    return list(nx.simple_cycles(G))
+    G.add_edges_from((src, tgt) for src, tgts in call_graph.items() for tgt in tgts)
+    return G
+
+def has_cycle(call_graph: Dict[str, Set[str]]) -> Optional[List[str]]:
+    """
+    إرجاع دورة واحدة كمثال إن وُجدت، أو None إذا كان الرسم خاليًا من الدورات
+    """
+    try:
+        edges = nx.find_cycle(_build_graph(call_graph), orientation='original')
+    except nx.NetworkXNoCycle:
+        return None
+    return [edge[0] for edge in edges]
+
+def all_cycles(call_graph: Dict[str, Set[str]], max_cycles: Optional[int] = MAX_CYCLES) -> List[List[str]]:
+    """
+    تعداد الدورات البسيطة مع حد أقصى max_cycles (None بلا حد) لأن عددها قد ينمو أسيًا في الرسوم الكبيرة.
+    النتيجة تتوقف عند الحد بصمت، فإذا كان طولها max_cycles فقد توجد دورات أخرى لم تُعد
+    """
+    # الفحص السريع بـ find_cycle يتجنب تشغيل simple_cycles على الرسوم الخالية من الدورات
+    if has_cycle(call_graph) is None:
+        return []
+    return list(islice(nx.simple_cycles(_build_graph(call_graph)), max_cycles))
+
+def find_cycles(call_graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    كل الدورات البسيطة بلا حد (الواجهة القديمة؛ all_cycles أو has_cycle أنسب للرسوم الكبيرة)
+    """
+    return all_cycles(call_graph, max_cycles=None)
 
 def save_call_graph_mermaid(call_graph: Dict[str, Set[str]], output_path: Path):
     mermaid = call_graph_to_mermaid(call_graph)
@@ -1,26 +1,60 @@
-import subprocess
 from pathlib import Path
 from typing import List, Dict
 import json
+from analysis_cache import get_source
+from batch_support import run_batched
+from cache_support import run_cached, tool_version
 
-def analyze_complexity_with_radon(py_files: List[Path]) -> Dict[str, dict]:
+try:
+    # استدعاء radon داخل نفس العملية بدل تشغيل مفسر بايثون جديد لكل دفعة
+    from radon.cli.tools import cc_to_dict
+    from radon.complexity import cc_visit, sorted_results
+    from radon.metrics import mi_visit, mi_rank
+except ImportError:
+    cc_visit = None
+
+def _run_radon(command: str, py_files: List[Path], default) -> Dict[str, dict]:
     results = {}
-    for file in py_files:
-        proc = subprocess.run(['radon', 'cc', '-s', '-j', str(file)], capture_output=True, text=True)
+    for chunk, proc in run_batched(['radon', command, '-s', '-j'], py_files):
         try:
             data = json.loads(proc.stdout)
-            results[str(file)] = data.get(str(file), [])
+            for file in chunk:
+                results[str(file)] = data.get(str(file), default)
         except Exception:
             continue
     return results
 
-def analyze_maintainability_with_radon(py_files: List[Path]) -> Dict[str, dict]:
+def _radon_in_process(py_files: List[Path], analyze) -> Dict[str, dict]:
     results = {}
     for file in py_files:
-        proc = subprocess.run(['radon', 'mi', '-s', '-j', str(file)], capture_output=True, text=True)
         try:
-            data = json.loads(proc.stdout)
-            results[str(file)] = data.get(str(file), {})
-        except Exception:
+            source = get_source(file).decode('utf-8')
+        except (OSError, UnicodeDecodeError):
             continue
-    return results 
\ No newline at end of file
+        try:
+            results[str(file)] = analyze(source)
+        except Exception as e:
+            # نفس شكل الخطأ الذي يخرجه radon من سطر الأوامر
+            results[str(file)] = {'error': str(e)}
+    return results
+
+def _cc(source: str) -> list:
+    return [cc_to_dict(block) for block in sorted_results(cc_visit(source))]
+
+def _mi(source: str) -> dict:
+    mi = mi_visit(source, True)
+    return {'mi': mi, 'rank': mi_rank(mi)}
+
+def analyze_complexity_with_radon(py_files: List[Path]) -> Dict[str, dict]:
+    if cc_visit is None:
+        compute = lambda files: _run_radon('cc', files, [])
+    else:
+        compute = lambda files: _radon_in_process(files, _cc)
+    return run_cached(f"{tool_version('radon')}:cc", py_files, compute)
+
+def analyze_maintainability_with_radon(py_files: List[Path]) -> Dict[str, dict]:
+    if cc_visit is None:
+        compute = lambda files: _run_radon('mi', files, {})
+    else:
+        compute = lambda files: _radon_in_process(files, _mi)
+    return run_cached(f"{tool_version('radon')}:mi", py_files, compute)
@@ -1,29 +1,89 @@
-import xml.etree.ElementTree as ET
+try:
+    # lxml أسرع بكثير ويدعم تصفية الوسوم أثناء القراءة
+    from lxml import etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+_ITERPARSE_OPTIONS = {'tag': 'class'} if _HAVE_LXML else {}
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _tally_lines(lines_elem) -> Tuple[int, int]:
+    """
+    عدّ الأسطر المغطاة والإجمالية داخل عنصر <lines>
+    """
+    total = 0
+    covered = 0
+    for line in lines_elem.iterfind('line'):
+        total += 1
+        hits = line.get('hits')
+        if hits and hits != '0':
+            covered += 1
+    return covered, total
+
+def _count_hits(hits):
+    covered = 0
+    for h in hits:
+        if h > 0:
+            covered += 1
+    return covered
+
+@lru_cache(maxsize=None)
+def _hits_counter():
+    """
+    _count_hits مترجمة بـ numba إن كانت مثبتة (تُستورد هنا لا في أعلى الوحدة لأن استيرادها بطيء)
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_count_hits)
+
+def _tally_lines_numba(lines_elem) -> Tuple[int, int]:
+    # lxml يجمع قيم hits في قائمة واحدة ثم تُعدّ في حلقة مترجمة بـ numba
+    hits = np.array(lines_elem.xpath('line/@hits'), dtype=np.int32)
+    return int(_hits_counter()(hits)), int(lines_elem.xpath('count(line)'))
+
+def _select_tally():
+    """
+    اختيار دالة العدّ: نسخة numba تحتاج xpath من lxml و numpy و numba، وإلا فالنسخة العادية
+    """
+    if _HAVE_LXML and np is not None and _hits_counter() is not None:
+        return _tally_lines_numba
+    return _tally_lines
 
 def parse_coverage_xml(xml_path: Path) -> Optional[Dict[str, float]]:
     """
     تحليل تقرير coverage.xml وإرجاع نسبة التغطية لكل ملف (filename -> percent)
     """
-    if not xml_path.exists():
+    # فتح الملف مباشرة بدل فحص وجوده أولاً (استدعاء نظام واحد وبدون سباق بين الفحص والفتح)
+    try:
+        fh = open(xml_path, 'rb')
+    except FileNotFoundError:
         return None
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
     coverage_data = {}
-    for cls in root.findall('.//class'):
-        filename = cls.attrib.get('filename')
-        lines_elem = cls.find('lines')
-        if not filename or lines_elem is None:
-            continue
-        total = 0
-        covered = 0
-        for line in lines_elem.findall('line'):
-            total += 1
-            if line.attrib.get('hits') and int(line.attrib['hits']) > 0:
-                covered += 1
-        percent = (covered / total * 100) if total > 0 else 0.0
-        coverage_data[filename] = percent
+    tally = _select_tally()
+    try:
+        # قراءة متدفقة: كل <class> يُعالج عند اكتماله ثم يُحرر من الذاكرة
+        for _, cls in ET.iterparse(fh, events=('end',), **_ITERPARSE_OPTIONS):
+            if cls.tag != 'class':
+                continue
+            filename = cls.get('filename')
+            lines_elem = cls.find('lines')
+            if filename and lines_elem is not None:
+                covered, total = tally(lines_elem)
+                coverage_data[filename] = (covered / total * 100) if total > 0 else 0.0
+            cls.clear()
+    finally:
+        fh.close()
     return coverage_data
 
 def get_overall_coverage(coverage_data: Dict[str, float]) -> float:
@@ -32,4 +92,4 @@ def get_overall_coverage(coverage_data: Dict[str, float]) -> float:
     """
     if not coverage_data:
         return 0.0
-    return sum(coverage_data.values()) / len(coverage_data) 
\ No newline at end of file
+    return sum(coverage_data.values()) / len(coverage_data) 
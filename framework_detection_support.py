@@ -1,6 +1,9 @@
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Union
+import mmap
+import os
 import re
+from analysis_cache import Corpus
 
 FRAMEWORK_HINTS = {
     'django': [r'import django', r'from django'],
@@ -21,15 +24,67 @@ FRAMEWORK_HINTS = {
     'svelte': [r'from \'svelte\''],
 }
 
-def detect_frameworks(files: List[Path]) -> Set[str]:
+# التلميحات تُطابق نص الملف بعد تحويله لحروف صغيرة، لذلك لا يطابق أي تلميح فيه حرف كبير (مثل 'import Vue').
+# المطابقة بدون تمييز الحالة على النص الأصلي تعادل ذلك بشرط استبعاد هذه التلميحات
+_LOWERCASE_HINTS = {
+    fw: [pat for pat in patterns if pat == pat.lower()]
+    for fw, patterns in FRAMEWORK_HINTS.items()
+}
+_LOWERCASE_HINTS = {fw: patterns for fw, patterns in _LOWERCASE_HINTS.items() if patterns}
+
+# نمط واحد مجمّع يُترجم مرة واحدة، كل إطار في مجموعة مسماة باسمه
+_FRAMEWORK_RE = re.compile(
+    '|'.join(f"(?P<{fw}>{'|'.join(patterns)})" for fw, patterns in _LOWERCASE_HINTS.items()).encode(),
+    re.IGNORECASE
+)
+
+_FRAMEWORK_IDS = list(_LOWERCASE_HINTS)
+
+# Hyperscan (اختياري) يفحص كل الأنماط دفعة واحدة بمسح SIMD بدل محرك re التراجعي
+try:
+    import hyperscan
+    _hs_db = hyperscan.Database()
+    _hs_db.compile(
+        expressions=['|'.join(patterns).encode() for patterns in _LOWERCASE_HINTS.values()],
+        ids=list(range(len(_FRAMEWORK_IDS))),
+        elements=len(_FRAMEWORK_IDS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_FRAMEWORK_IDS),
+    )
+except Exception:
+    _hs_db = None
+
+MAX_SCAN_BYTES = 50 * 1024 * 1024
+
+def _scan(buffer, found: Set[str]):
+    if _hs_db is not None:
+        def on_match(fw_id, start, end, flags, context):
+            found.add(_FRAMEWORK_IDS[fw_id])
+        _hs_db.scan(buffer, match_event_handler=on_match)
+        return
+    for match in _FRAMEWORK_RE.finditer(buffer):
+        found.add(match.lastgroup)
+
+def detect_frameworks(files: Union[List[Path], Corpus]) -> Set[str]:
     found = set()
+    if isinstance(files, Corpus):
+        # المحتوى مقروء مسبقًا، فيُفحص مباشرة بدون فتح الملفات مرة أخرى
+        for data in files.files.values():
+            if len(data) <= MAX_SCAN_BYTES:
+                _scan(data, found)
+            if len(found) == len(_FRAMEWORK_IDS):
+                break
+        return found
     for file in files:
         try:
-            content = file.read_text(encoding='utf-8', errors='ignore').lower()
-            for fw, patterns in FRAMEWORK_HINTS.items():
-                for pat in patterns:
-                    if re.search(pat, content):
-                        found.add(fw)
+            with open(file, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0 or size > MAX_SCAN_BYTES:
+                    continue
+                # البحث مباشرة في الملف المعيّن في الذاكرة بدون نسخه أو فك ترميزه
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    _scan(mm, found)
         except Exception:
             continue
-    return found 
\ No newline at end of file
+        if len(found) == len(_FRAMEWORK_IDS):
+            break
+    return found
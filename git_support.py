@@ -3,6 +3,10 @@ from pathlib import Path
 from typing import List, Dict
 import tempfile
 import shutil
+import re
+
+# عدد الكوميتات ثم الاسم، مفصولان بأي مسافات (ليس بالضرورة \t)
+_SHORTLOG_RE = re.compile(rb'^\s*(\d+)\s+(.+?)\s*$', re.M)
 
 def get_contributors(repo_path: Path) -> List[Dict]:
     """
@@ -11,15 +15,11 @@ def get_contributors(repo_path: Path) -> List[Dict]:
     try:
         result = subprocess.run([
             'git', '-C', str(repo_path), 'shortlog', '-s', '-n', '--all', '--no-merges'
-        ], capture_output=True, text=True, check=True)
-        lines = result.stdout.strip().splitlines()
-        contributors = []
-        for line in lines:
-            parts = line.strip().split('\t')
-            if len(parts) == 2:
-                commits, name = parts
-                contributors.append({'name': name.strip(), 'commits': int(commits.strip())})
-        return contributors
+        ], capture_output=True, check=True)
+        return [
+            {'name': m.group(2).decode('utf-8', 'replace'), 'commits': int(m.group(1))}
+            for m in _SHORTLOG_RE.finditer(result.stdout)
+        ]
     except Exception:
         return []
 
@@ -14,8 +14,11 @@ import markdown
 import io
 import base64
 import os
+import shutil
 from tkinter import filedialog, messagebox
 import json
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 
 class ProjectPicker(ttk.Frame):
     def __init__(self, parent, on_pick):
@@ -87,77 +90,154 @@ class ThreadedAnalyzer:
     def flush(self):
         pass 
 
+# مجمع خيوط مشترك لقراءة ملفات النتائج دون حجب حلقة Tk الرئيسية
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
+def _read_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _read_diagram(output_dir):
+    data = _read_file(os.path.join(output_dir, 'architecture.png'))
+    if data is not None:
+        img = Image.open(io.BytesIO(data))
+        return 'architecture.png', img.resize((600, 400))
+    return 'architecture.mmd', _read_file(os.path.join(output_dir, 'architecture.mmd'))
+
 class ResultsViewer(ttk.Frame):
+    TAB_ORDER = ('readme', 'diagrams', 'summaries')
+
     def __init__(self, parent, output_dir):
         super().__init__(parent)
         self.output_dir = output_dir
         self.tabs = None
         self.files = []
+        self._tab_names = {}
         self.init_ui()
     def init_ui(self):
         theme = get_theme()
         self.tabs = ttk.Notebook(self)
         self.files = []
-        # README
-        readme_tab = scrolledtext.ScrolledText(self.tabs, wrap='word', font=("Arial", 12))
-        readme_path = os.path.join(self.output_dir, 'readme-enhanced.md')
-        if os.path.exists(readme_path):
-            with open(readme_path, encoding='utf-8') as f:
-                md = f.read()
-                readme_tab.insert('1.0', md)
-            self.files.append(('readme', readme_path))
-        self.tabs.add(readme_tab, text=tr('readme'))
-        # Mermaid/PNG
-        mmd_path = os.path.join(self.output_dir, 'architecture.mmd')
-        png_path = os.path.join(self.output_dir, 'architecture.png')
-        if os.path.exists(png_path):
-            img_tab = tk.Frame(self.tabs)
-            img = Image.open(png_path)
-            img = img.resize((600, 400))
-            self.imgtk = ImageTk.PhotoImage(img)
-            label = tk.Label(img_tab, image=self.imgtk)
-            label.pack()
-            self.tabs.add(img_tab, text=tr('diagrams'))
-            self.files.append(('diagrams', png_path))
-        elif os.path.exists(mmd_path):
-            mmd_tab = scrolledtext.ScrolledText(self.tabs, wrap='word', font=("Arial", 12))
-            with open(mmd_path, encoding='utf-8') as f:
-                mmd = f.read()
-                mmd_tab.insert('1.0', mmd)
-            self.tabs.add(mmd_tab, text=tr('diagrams'))
-            self.files.append(('diagrams', mmd_path))
-        # AI Summary
-        summary_path = os.path.join(self.output_dir, 'ai-summary.json')
-        if os.path.exists(summary_path):
-            summary_tab = scrolledtext.ScrolledText(self.tabs, wrap='word', font=("Arial", 12))
-            with open(summary_path, encoding='utf-8') as f:
-                summary_tab.insert('1.0', f.read())
-            self.tabs.add(summary_tab, text=tr('summaries'))
-            self.files.append(('summaries', summary_path))
         self.tabs.pack(fill='both', expand=True)
         # زر تصدير
         export_btn = ttk.Button(self, text=tr('export'), command=self.export_current)
         export_btn.pack(pady=5)
+        self._load_all()
+    def _load_all(self):
+        readme_path = os.path.join(self.output_dir, 'readme-enhanced.md')
+        summary_path = os.path.join(self.output_dir, 'ai-summary.json')
+        loads = {
+            'readme': (_IO_POOL.submit(_read_file, readme_path), readme_path),
+            'diagrams': (_IO_POOL.submit(_read_diagram, self.output_dir), None),
+            'summaries': (_IO_POOL.submit(_read_file, summary_path), summary_path),
+        }
+        for name, (future, path) in loads.items():
+            future.add_done_callback(lambda fut, name=name, path=path: self._post_install(name, path, fut))
+    def _post_install(self, name, path, future):
+        try:
+            data = future.result()
+        except Exception:
+            data = None
+        if name == 'diagrams' and data is not None:
+            filename, data = data
+            path = os.path.join(self.output_dir, filename) if data is not None else None
+        try:
+            self.after(0, self._install_tab, name, path, data)
+        except (tk.TclError, RuntimeError):
+            pass  # أُغلقت النافذة قبل انتهاء القراءة
+    def _install_tab(self, name, path, data):
+        if data is None and name != 'readme':
+            return
+        if isinstance(data, Image.Image):
+            tab = tk.Frame(self.tabs)
+            self.imgtk = ImageTk.PhotoImage(data)
+            tk.Label(tab, image=self.imgtk).pack()
+        else:
+            tab = scrolledtext.ScrolledText(self.tabs, wrap='word', font=("Arial", 12))
+            if data is not None:
+                tab.insert('1.0', data.decode('utf-8', errors='replace'))
+        # الحفاظ على ترتيب التبويبات مهما كان ترتيب انتهاء القراءة
+        order = self.TAB_ORDER.index(name)
+        pos = sum(1 for other in self._tab_names.values() if self.TAB_ORDER.index(other) < order)
+        self.tabs.insert(pos if pos < len(self.tabs.tabs()) else 'end', tab, text=tr(name))
+        self._tab_names[str(tab)] = name
+        if data is not None:
+            self.files.append((name, path))
+            self.files.sort(key=lambda item: self.TAB_ORDER.index(item[0]))
     def export_current(self):
-        idx = self.tabs.index(self.tabs.select())
-        if idx < len(self.files):
-            _, file_path = self.files[idx]
+        name = self._tab_names.get(self.tabs.select())
+        file_path = dict(self.files).get(name)
+        if file_path:
             ext = os.path.splitext(file_path)[1]
             save_path = filedialog.asksaveasfilename(defaultextension=ext, filetypes=[('All Files', '*.*')])
             if save_path:
                 try:
-                    with open(file_path, 'rb') as src, open(save_path, 'wb') as dst:
-                        dst.write(src.read())
+                    shutil.copyfile(file_path, save_path)
                     messagebox.showinfo(tr('success'), tr('export'))
                 except Exception as e:
                     messagebox.showerror(tr('error'), str(e)) 
 
+# آخر قراءة لكل مجلد مع st_mtime_ns الخاص به: إعادة فتح متصفح الملفات لا تعيد قراءة المجلدات التي لم تتغير.
+# الذاكرة محدودة بـ LS_CACHE_SIZE مجلدًا (الأقدم استخدامًا يُحذف أولًا) وتُفرغ عند تغير مجلد المشروع
+LS_CACHE_SIZE = 4096
+_LS_CACHE = OrderedDict()
+_ls_root = None
+
+def _ls_set_root(root):
+    global _ls_root
+    if root != _ls_root:
+        _LS_CACHE.clear()
+        _ls_root = root
+
+def _ls(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _LS_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        _LS_CACHE.move_to_end(path)
+        return cached[1], cached[2]
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    dirs.append(entry.path)
+            else:
+                files.append(entry.path)
+    _LS_CACHE[path] = (mtime, dirs, files)
+    _LS_CACHE.move_to_end(path)
+    if len(_LS_CACHE) > LS_CACHE_SIZE:
+        _LS_CACHE.popitem(last=False)
+    return dirs, files
+
 class FileBrowser(ttk.Frame):
+    INSERT_BATCH = 500
+
     def __init__(self, parent, project_path, output_dir):
         super().__init__(parent)
         self.project_path = project_path
         self.output_dir = output_dir
+        self._all_rel_paths = []
+        self._all_lower = []
+        self._search_job = None
+        self._inserted = 0
+        self._summaries = {}  # المسار النسبي -> ((st_mtime_ns، الحجم) لملف الملخص، Future لقراءته)
         self.init_ui()
+    def _list_files(self):
+        _ls_set_root(self.project_path)
+        rel_paths = []
+        stack = [self.project_path]
+        while stack:
+            try:
+                dirs, files = _ls(stack.pop())
+            except OSError:
+                continue
+            stack.extend(dirs)
+            rel_paths.extend(os.path.relpath(path, self.project_path) for path in files)
+        rel_paths.sort()
+        return rel_paths
     def init_ui(self):
         theme = get_theme()
         # شريط البحث
@@ -170,39 +250,69 @@ class FileBrowser(ttk.Frame):
         # ملخص الملف
         summary_box = scrolledtext.ScrolledText(self, height=8, font=("Arial", 11))
         summary_box.pack(fill='x', pady=5)
-        # بناء الشجرة
-        for root, dirs, files in os.walk(self.project_path):
-            for file in files:
-                rel_path = os.path.relpath(os.path.join(root, file), self.project_path)
-                tree.insert('', 'end', rel_path, text=rel_path)
+        # بناء الشجرة (قائمة الملفات تُقرأ مرة واحدة ويُبحث فيها من الذاكرة)
+        self._all_rel_paths = self._list_files()
+        self._all_lower = [p.lower() for p in self._all_rel_paths]
+        # معرّفات رقمية بدل المسارات (لا تحتاج escaping في Tk)، والإدراج على دفعات حتى لا تتجمد الواجهة
+        def insert_batch():
+            start = self._inserted
+            end = min(start + self.INSERT_BATCH, len(self._all_rel_paths))
+            for i in range(start, end):
+                tree.insert('', 'end', iid=str(i), text=self._all_rel_paths[i])
+            self._inserted = end
+            # مع بحث نشط تُخفى العناصر غير المطابقة من هذه الدفعة فقط، بدل إعادة تصفية الشجرة كلها بعد كل دفعة
+            q = search_var.get().lower()
+            if q:
+                hidden = [str(i) for i in range(start, end) if q not in self._all_lower[i]]
+                if hidden:
+                    tree.detach(*hidden)
+            if end < len(self._all_rel_paths):
+                self.after_idle(insert_batch)
+        def show_summary(rel_path, data):
+            sel = tree.selection()
+            if not sel or self._all_rel_paths[int(sel[0])] != rel_path:
+                return  # تغير الاختيار قبل انتهاء القراءة
+            summary_box.config(state='normal')
+            summary_box.delete('1.0', tk.END)
+            if data is not None:
+                summary_box.insert('1.0', data.decode('utf-8', errors='replace'))
+            else:
+                summary_box.insert('1.0', tr('summaries'))
+            summary_box.config(state='disabled')
+        def post_summary(rel_path, future):
+            try:
+                self.after(0, show_summary, rel_path, future.result())
+            except (tk.TclError, RuntimeError):
+                pass  # أُغلقت النافذة قبل انتهاء القراءة
+        # قراءة الملخص في مجمع الخيوط، والملخصات المقروءة تبقى في الذاكرة فيظهر الملف المختار سابقًا فورًا
         def on_select(event):
             sel = tree.selection()
             if sel:
-                rel_path = sel[0]
+                rel_path = self._all_rel_paths[int(sel[0])]
                 summary_path = os.path.join(self.output_dir, 'file-summaries', rel_path + '.md')
-                summary_box.config(state='normal')
-                summary_box.delete('1.0', tk.END)
-                if os.path.exists(summary_path):
-                    with open(summary_path, encoding='utf-8') as f:
-                        summary_box.insert('1.0', f.read())
-                else:
-                    summary_box.insert('1.0', tr('summaries'))
-                summary_box.config(state='disabled')
+                # الملخص المقروء سابقًا يُستخدم ما دام ملفه لم يتغير (أو لم يُنشأ بعد)
+                try:
+                    st = os.stat(summary_path)
+                    key = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    key = None
+                cached = self._summaries.get(rel_path)
+                if cached is None or cached[0] != key:
+                    cached = self._summaries[rel_path] = (key, _IO_POOL.submit(_read_file, summary_path))
+                cached[1].add_done_callback(lambda fut, rel_path=rel_path: post_summary(rel_path, fut))
         tree.bind('<<TreeviewSelect>>', on_select)
-        # البحث
-        def on_search(*_):
+        # البحث (مؤجل 150ms حتى لا يُعاد التصفية مع كل حرف)
+        def apply_search():
+            self._search_job = None
             q = search_var.get().lower()
-            for iid in tree.get_children():
-                tree.detach(iid)
-            for root, dirs, files in os.walk(self.project_path):
-                for file in files:
-                    rel_path = os.path.relpath(os.path.join(root, file), self.project_path)
-                    if q in rel_path.lower():
-                        if not tree.exists(rel_path):
-                            tree.insert('', 'end', rel_path, text=rel_path)
-                        else:
-                            tree.reattach(rel_path, '', 'end')
-        search_var.trace_add('write', on_search) 
+            matches = [str(i) for i in range(self._inserted) if q in self._all_lower[i]]
+            tree.set_children('', *matches)
+        def on_search(*_):
+            if self._search_job is not None:
+                self.after_cancel(self._search_job)
+            self._search_job = self.after(150, apply_search)
+        search_var.trace_add('write', on_search)
+        insert_batch()
 
 class Dashboard(ttk.Frame):
     def __init__(self, parent, output_dir):
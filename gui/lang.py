@@ -58,11 +58,14 @@ LANGS = {
 }
 
 current_lang = 'ar'
+# دالة get للقاموس النشط، تُحدّث في set_lang لتجنب البحث في LANGS مع كل استدعاء لـ tr
+_active_get = LANGS[current_lang].get
 
 def tr(key):
-    return LANGS[current_lang].get(key, key)
+    return _active_get(key, key)
 
 def set_lang(lang):
-    global current_lang
+    global current_lang, _active_get
     if lang in LANGS:
-        current_lang = lang 
\ No newline at end of file
+        current_lang = lang
+        _active_get = LANGS[lang].get
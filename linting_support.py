@@ -1,25 +1,54 @@
-import subprocess
 from pathlib import Path
 from typing import List, Dict
+import io
+import json
+from batch_support import run_batched
+from cache_support import run_cached, tool_version
 
-def run_pylint_on_files(files: List[Path]) -> List[Dict]:
-    """
-    تشغيل pylint على قائمة من الملفات وإرجاع النتائج (كل نتيجة عبارة عن dict)
-    """
-    results = []
-    for file in files:
-        proc = subprocess.run([
-            'pylint', str(file), '--output-format=json', '--score=n'
-        ], capture_output=True, text=True)
+def _group_by_file(chunk: List[Path], lint_results: List[Dict], grouped: Dict[str, List[Dict]]):
+    names = {str(Path(file).resolve()): str(file) for file in chunk}
+    for file in chunk:
+        grouped[str(file)] = []
+    for item in lint_results:
+        path = item.get('path', '')
+        item['file'] = names.get(str(Path(path).resolve()), path)
+        grouped.setdefault(item['file'], []).append(item)
+
+def _run_pylint_subprocess(files: List[Path]) -> Dict[str, List[Dict]]:
+    grouped = {}
+    for chunk, proc in run_batched(['pylint'], files, ['--output-format=json', '--score=n']):
         if proc.returncode == 0 or proc.returncode == 32:  # 32: usage error, 0: no error
             try:
-                import json
                 lint_results = json.loads(proc.stdout)
-                for item in lint_results:
-                    item['file'] = str(file)
-                results.extend(lint_results)
             except Exception:
                 continue
+            _group_by_file(chunk, lint_results, grouped)
         else:
-            results.append({'file': str(file), 'error': proc.stderr})
-    return results 
\ No newline at end of file
+            for file in chunk:
+                grouped[str(file)] = [{'file': str(file), 'error': proc.stderr}]
+    return grouped
+
+def _run_pylint(files: List[Path]) -> Dict[str, List[Dict]]:
+    try:
+        # pylint داخل نفس العملية: استيراد واحد بدل تشغيل مفسر جديد لكل دفعة
+        from pylint.lint import Run
+        from pylint.reporters import JSONReporter
+    except ImportError:
+        return _run_pylint_subprocess(files)
+    output = io.StringIO()
+    try:
+        Run([*map(str, files), '--score=n'], reporter=JSONReporter(output), exit=False)
+        lint_results = json.loads(output.getvalue() or '[]')
+    except Exception as e:
+        return {str(file): [{'file': str(file), 'error': str(e)}] for file in files}
+    grouped = {}
+    _group_by_file(files, lint_results, grouped)
+    return grouped
+
+def run_pylint_on_files(files: List[Path]) -> List[Dict]:
+    """
+    تشغيل pylint على قائمة من الملفات وإرجاع النتائج (كل نتيجة عبارة عن dict)
+    """
+    grouped = run_cached(tool_version('pylint'), files, _run_pylint,
+                         should_cache=lambda items: not any('error' in item for item in items))
+    return [item for items in grouped.values() for item in items]
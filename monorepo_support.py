@@ -1,16 +1,45 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
+PROJECT_FILES = frozenset({
+    'package.json', 'requirements.txt', 'Pipfile', 'pubspec.yaml',
+    'Cargo.toml', 'go.mod', 'pom.xml', 'composer.json'
+})
+SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build'})
+
+def _scan_dir(path: str, subprojects: List[Path], stack: List[str]):
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        # نوع المدخل يأتي من قراءة المجلد نفسها، فلا حاجة لاستدعاء stat إضافي
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                stack.append(entry.path)
+        elif entry.name in PROJECT_FILES:
+            subprojects.append(Path(entry.path).parent)
+
+def _scan_tree(top: str) -> List[Path]:
+    subprojects = []
+    stack = [top]
+    while stack:
+        _scan_dir(stack.pop(), subprojects, stack)
+    return subprojects
+
 def find_subprojects(root: Path) -> List[Path]:
     """
     البحث عن مجلدات مشاريع فرعية (monorepo) عبر ملفات إعداد معروفة
     """
-    project_files = [
-        'package.json', 'requirements.txt', 'Pipfile', 'pubspec.yaml',
-        'Cargo.toml', 'go.mod', 'pom.xml', 'composer.json'
-    ]
     subprojects = []
-    for path in root.rglob('*'):
-        if path.is_file() and path.name in project_files:
-            subprojects.append(path.parent)
-    return subprojects 
\ No newline at end of file
+    top_dirs = []
+    _scan_dir(str(root), subprojects, top_dirs)
+    if top_dirs:
+        # كل مجلد في المستوى الأول يُفحص في خيط مستقل لأن العمل هنا انتظار لعمليات نظام الملفات
+        with ThreadPoolExecutor(max_workers=min(len(top_dirs), (os.cpu_count() or 1) * 2)) as ex:
+            for found in ex.map(_scan_tree, top_dirs):
+                subprojects.extend(found)
+    return subprojects
@@ -1,28 +1,26 @@
-import subprocess
 from pathlib import Path
 from typing import List, Dict
+import json
+import re
+from batch_support import run_batched
+
+# المسار قد يحتوي على ':' (مثل C:\ في Windows) لذا نطابق الحقول الرقمية بعده
+_FLAKE8_LINE_RE = re.compile(r'^(.*?):(\d+):(\d+):([^:]+):(.*)$')
 
 def run_flake8_on_files(files: List[Path]) -> List[Dict]:
     results = []
-    for file in files:
-        proc = subprocess.run([
-            'flake8', str(file), '--format=%(row)d:%(col)d:%(code)s:%(text)s'
-        ], capture_output=True, text=True)
+    for _, proc in run_batched(['flake8'], files, ['--format=%(path)s:%(row)d:%(col)d:%(code)s:%(text)s']):
         for line in proc.stdout.strip().splitlines():
-            parts = line.split(':', 3)
-            if len(parts) == 4:
-                row, col, code, text = parts
-                results.append({'file': str(file), 'row': row, 'col': col, 'code': code, 'text': text})
+            match = _FLAKE8_LINE_RE.match(line)
+            if match:
+                path, row, col, code, text = match.groups()
+                results.append({'file': path, 'row': row, 'col': col, 'code': code, 'text': text})
     return results
 
 def run_eslint_on_files(files: List[Path]) -> List[Dict]:
     results = []
-    for file in files:
-        proc = subprocess.run([
-            'eslint', '--format', 'json', str(file)
-        ], capture_output=True, text=True)
+    for _, proc in run_batched(['eslint', '--format', 'json'], files):
         try:
-            import json
             lint_results = json.loads(proc.stdout)
             for res in lint_results:
                 for msg in res.get('messages', []):
@@ -35,4 +33,4 @@ def run_eslint_on_files(files: List[Path]) -> List[Dict]:
                     })
         except Exception:
             continue
-    return results 
\ No newline at end of file
+    return results
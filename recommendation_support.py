@@ -1,17 +1,64 @@
-from typing import Dict, List
+import functools
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+DEFAULT_THRESHOLDS = {
+    'max_average_complexity': 10,
+    'max_total_lines': 10000,
+    'min_coverage': 60,
+    'max_lint_issues': 20,
+    'max_functions_per_file': 10,
+}
+
+# كل قاعدة: (اسم الحد، شرط على المقاييس والتغطية وعدد مشاكل linting والحد، نص التوصية)
+_RULES = (
+    ('max_average_complexity', lambda m, c, l, t: m.get('average_complexity', 0) > t,
+     "الكود معقد جدًا في بعض الملفات، يُنصح بتقسيمها أو إعادة هيكلتها."),
+    ('max_total_lines', lambda m, c, l, t: m.get('total_lines', 0) > t,
+     "المشروع كبير جدًا، فكر في تقسيمه إلى وحدات أو حزم أصغر."),
+    ('min_coverage', lambda m, c, l, t: c is not None and c < t,
+     "تغطية الاختبارات أقل من {}%، يُنصح بزيادة الاختبارات."),
+    ('max_lint_issues', lambda m, c, l, t: l is not None and l > t,
+     "هناك العديد من مشاكل linting، يُنصح بتحسين جودة الكود."),
+    ('max_functions_per_file', lambda m, c, l, t: m.get('total_functions', 0) / (m.get('total_files', 1) or 1) > t,
+     "هناك كثافة دوال عالية في بعض الملفات، فكر في توزيع الوظائف."),
+)
+_DEFAULT_RECOMMENDATION = "الكود منظم وجيد، استمر في العمل الجيد!"
+
+RecommendationEngine = Callable[[Dict, Optional[float], Optional[int]], List[str]]
+
+@functools.lru_cache(maxsize=8)
+def _bind_rules(config_items: FrozenSet) -> Tuple:
+    # تثبيت الحدود وتنسيق النصوص مرة واحدة لكل إعداد
+    thresholds = {**DEFAULT_THRESHOLDS, **dict(config_items)}
+    return tuple((predicate, thresholds[key], message.format(thresholds[key])) for key, predicate, message in _RULES)
+
+@functools.lru_cache(maxsize=8)
+def _compile(config_items: FrozenSet) -> RecommendationEngine:
+    rules = _bind_rules(config_items)
+
+    def engine(metrics: Dict, coverage: float = None, lint_issues: int = None) -> List[str]:
+        return [message for predicate, threshold, message in rules
+                if predicate(metrics, coverage, lint_issues, threshold)] or [_DEFAULT_RECOMMENDATION]
+    return engine
+
+def compile_recommendation_engine(config: Optional[Dict] = None) -> RecommendationEngine:
+    """
+    بناء دالة توصيات بحدود مخصصة (تُدمج مع DEFAULT_THRESHOLDS)، تُبنى مرة واحدة لكل إعداد وتُعاد من الذاكرة بعدها
+    """
+    return _compile(frozenset((config or {}).items()))
+
+def iter_recommendations(metrics: Dict, coverage: float = None, lint_issues: int = None,
+                         config: Optional[Dict] = None) -> Iterator[str]:
+    """
+    توليد التوصيات واحدة تلو الأخرى بدون بناء قائمة (للمستهلك الذي يمر عليها مرة واحدة)
+    """
+    empty = True
+    for predicate, threshold, message in _bind_rules(frozenset((config or {}).items())):
+        if predicate(metrics, coverage, lint_issues, threshold):
+            empty = False
+            yield message
+    if empty:
+        yield _DEFAULT_RECOMMENDATION
 
 def generate_recommendations(metrics: Dict, coverage: float = None, lint_issues: int = None) -> List[str]:
-    recs = []
-    if metrics.get('average_complexity', 0) > 10:
-        recs.append("الكود معقد جدًا في بعض الملفات، يُنصح بتقسيمها أو إعادة هيكلتها.")
-    if metrics.get('total_lines', 0) > 10000:
-        recs.append("المشروع كبير جدًا، فكر في تقسيمه إلى وحدات أو حزم أصغر.")
-    if coverage is not None and coverage < 60:
-        recs.append("تغطية الاختبارات أقل من 60%، يُنصح بزيادة الاختبارات.")
-    if lint_issues is not None and lint_issues > 20:
-        recs.append("هناك العديد من مشاكل linting، يُنصح بتحسين جودة الكود.")
-    if metrics.get('total_functions', 0) / (metrics.get('total_files', 1)) > 10:
-        recs.append("هناك كثافة دوال عالية في بعض الملفات، فكر في توزيع الوظائف.")
-    if not recs:
-        recs.append("الكود منظم وجيد، استمر في العمل الجيد!")
-    return recs 
\ No newline at end of file
+    return compile_recommendation_engine()(metrics, coverage, lint_issues)
@@ -1,15 +1,108 @@
-import subprocess
 from pathlib import Path
-from typing import List, Dict
-import json
+from typing import List, Dict, Optional
+import asyncio
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from batch_support import chunk_files, process_workers, use_process_pool
+from cache_support import run_cached, tool_version
 
-def analyze_security_with_bandit(py_files: List[Path]) -> Dict[str, dict]:
+try:
+    # orjson أسرع في فك تقارير bandit الكبيرة ويقبل bytes مباشرة
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+_BANDIT_CMD = ['bandit', '-f', 'json', '-q']
+PARALLEL_MIN_FILES = 64
+
+def _group_by_file(chunk: List[Path], issues: List[Dict], results: Dict[str, list]):
+    names = {str(Path(file).resolve()): str(file) for file in chunk}
+    for file in chunk:
+        results[str(file)] = []
+    for issue in issues:
+        filename = issue.get('filename', '')
+        results.setdefault(names.get(str(Path(filename).resolve()), filename), []).append(issue)
+
+def _load_report(path: str):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if _json.__name__ == 'orjson':
+            with memoryview(mm) as view:
+                return _json.loads(view)
+        return _json.loads(mm[:])
+
+async def _bandit_report(files: List[Path], sem: asyncio.Semaphore) -> Optional[Dict]:
+    # bandit يكتب التقرير في ملف مؤقت يُقرأ عبر mmap بدل تجميعه من الأنبوب في الذاكرة
+    fd, report = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        async with sem:
+            proc = await asyncio.create_subprocess_exec(
+                *_BANDIT_CMD, '-o', report, '--', *map(str, files),
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            await proc.wait()
+        return _load_report(report)
+    except (OSError, ValueError):  # bandit غير مثبت، أو تقرير فارغ أو JSON غير صالح
+        return None
+    finally:
+        os.remove(report)
+
+async def _run_bandit_async(py_files: List[Path]) -> Dict[str, list]:
+    # تشغيل bandit مرة واحدة لكل دفعة من الملفات، وعدة دفعات في نفس الوقت
+    sem = asyncio.Semaphore((process_workers() or os.cpu_count() or 1) * 2)
+    chunks = chunk_files(py_files)
+    reports = await asyncio.gather(*(_bandit_report(chunk, sem) for chunk in chunks))
     results = {}
-    for file in py_files:
-        proc = subprocess.run(['bandit', '-f', 'json', '-q', str(file)], capture_output=True, text=True)
-        try:
-            data = json.loads(proc.stdout)
+    retry = []
+    for chunk, data in zip(chunks, reports):
+        if data is None:
+            retry.extend(chunk)
+        else:
+            _group_by_file(chunk, data.get('results', []), results)
+    # فشل تحليل مخرجات الدفعة: إعادة المحاولة ملفًا ملفًا لعزل الملف المسبب
+    reports = await asyncio.gather(*(_bandit_report([file], sem) for file in retry))
+    for file, data in zip(retry, reports):
+        if data is not None:
             results[str(file)] = data.get('results', [])
-        except Exception:
-            continue
-    return results 
\ No newline at end of file
+    return results
+
+def _run_bandit_subprocess(py_files: List[Path]) -> Dict[str, list]:
+    return asyncio.run(_run_bandit_async(py_files))
+
+def _bandit_issues(files: List[str]) -> List[Dict]:
+    # bandit داخل نفس العملية: تحميل الإضافات مرة واحدة بدل تشغيل مفسر جديد لكل دفعة
+    from bandit.core import config as b_config, docs_utils, manager as b_manager
+    mgr = b_manager.BanditManager(b_config.BanditConfig(), 'file', quiet=True)
+    mgr.discover_files(files)
+    mgr.run_tests()
+    issues = []
+    for issue in mgr.get_issue_list():
+        # نفس شكل تقرير bandit -f json
+        item = issue.as_dict()
+        item['more_info'] = docs_utils.get_url(item['test_id'])
+        issues.append(item)
+    return issues
+
+def _run_bandit(py_files: List[Path]) -> Dict[str, list]:
+    names = [str(file) for file in py_files]
+    try:
+        if not use_process_pool(len(names), PARALLEL_MIN_FILES):
+            issues = _bandit_issues(names)
+        else:
+            # الفحص يستهلك المعالج، فتُوزع دفعات الملفات على عدة عمليات
+            with ProcessPoolExecutor(max_workers=process_workers()) as ex:
+                issues = [issue for part in ex.map(_bandit_issues, chunk_files(names)) for issue in part]
+    except Exception:
+        # bandit غير مثبت كمكتبة أو واجهته تختلف بين الإصدارات، فنرجع للأداة الخارجية
+        return _run_bandit_subprocess(py_files)
+    results = {}
+    _group_by_file(py_files, issues, results)
+    return results
+
+def analyze_security_with_bandit(py_files: List[Path]) -> Dict[str, dict]:
+    """
+    فحص أمان ملفات بايثون بـ bandit، مع إعادة استخدام نتائج الملفات التي لم تتغير منذ آخر تشغيل
+    """
+    return run_cached(tool_version('bandit'), py_files, _run_bandit)
@@ -5,17 +5,25 @@ SmartRepo Analyzer - AI-Powered Code Analysis and Documentation Tool
 A comprehensive tool for analyzing codebases and generating AI-optimized documentation.
 """
 
+import io
 import os
 import json
 import ast
 import re
 import argparse
+import shutil
 import subprocess
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, Iterator, List, Any, Optional, Set
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from functools import cached_property, lru_cache
+from collections import Counter, defaultdict
+from operator import attrgetter
 import hashlib
+import heapq
+import sys
 from rich.progress import Progress, TimeElapsedColumn, TimeRemainingColumn
 import time
 from rich.progress import Progress
@@ -24,6 +32,16 @@ from rich.panel import Panel
 from rich.text import Text
 from rich import box
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Core dependencies (install with: pip install -r requirements.txt)
 try:
     import yaml
@@ -37,19 +55,116 @@ except ImportError:
 from coverage_support import parse_coverage_xml, get_overall_coverage
 from linting_support import run_pylint_on_files
 from monorepo_support import find_subprojects
-from uml_support import generate_mermaid_class_diagram
+from uml_support import collect_classes, generate_mermaid_class_diagram
 from usage_example_support import extract_usage_examples
-from summarization_support import summarize_file
-from callgraph_support import extract_call_graph, save_call_graph_mermaid, find_cycles
+from summarization_support import summarize_file, summarize_source
+from callgraph_support import MAX_CYCLES, extract_call_graph, save_call_graph_mermaid, all_cycles
 from framework_detection_support import detect_frameworks
 from git_support import get_contributors
 from multi_lint_support import run_flake8_on_files, run_eslint_on_files
-from recommendation_support import generate_recommendations
+from recommendation_support import iter_recommendations
 from complexity_support import analyze_complexity_with_radon, analyze_maintainability_with_radon
 from security_support import analyze_security_with_bandit
-from ai_summarization_support import ai_summarize_code
-
-@dataclass
+from analysis_cache import Corpus, get_source, parse_source
+from cache_support import get_cache, python_tool, reset_cache, run_cached, stat_snapshot
+from batch_support import process_workers, set_process_workers, use_process_pool
+
+__version__ = "1.0.0"
+
+# Below this many files, process start-up costs more than the parallel analysis saves
+PARALLEL_MIN_FILES = 64
+# Files longer than this many lines get a summary file
+SUMMARY_MIN_LINES = 100
+
+# Larger files are generated bundles or vendored blobs, not code worth analyzing
+MAX_FILE_BYTES = 2 * 1024 * 1024
+# PNG, ELF, ZIP and PDF signatures: binary content behind a source-code extension
+_BINARY_MAGIC = (b'\x89PNG', b'\x7fELF', b'PK\x03\x04', b'%PDF')
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file (with orjson when installed)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _open_buffered(path: Path) -> io.TextIOWrapper:
+    """Open path for UTF-8 text output behind a 64 KiB write buffer"""
+    raw = open(path, 'wb')
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=65536), encoding='utf-8', write_through=False)
+
+def _write_json(path: Path, obj: Any):
+    """Write obj as indented UTF-8 JSON (with orjson when installed)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        # json.dump streams the encoder's chunks into the buffer instead of building the whole string
+        with _open_buffered(path) as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
+# JavaScript/TypeScript patterns, compiled once at import instead of looked up on every file
+_JS_FUNC_RES = [re.compile(p) for p in (
+    r'function\s+(\w+)',
+    r'const\s+(\w+)\s*=\s*(?:async\s+)?\(',
+    r'let\s+(\w+)\s*=\s*(?:async\s+)?\(',
+    r'var\s+(\w+)\s*=\s*(?:async\s+)?\(',
+    r'(\w+):\s*(?:async\s+)?function',
+    r'(\w+)\s*=\s*(?:async\s+)?\('
+)]
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)')
+_JS_IMPORT_RES = [re.compile(p) for p in (
+    r'import.*from\s+[\'"]([^\'"]+)[\'"]',
+    r'import\s+[\'"]([^\'"]+)[\'"]',
+    r'require\([\'"]([^\'"]+)[\'"]\)'
+)]
+_JS_ALL_RES = [*_JS_FUNC_RES, _JS_CLASS_RE, *_JS_IMPORT_RES]
+
+# Optional: one Hyperscan pass tells which patterns occur in a file at all, so re.findall
+# only runs for those (identical results, most files skip most patterns)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+@lru_cache(maxsize=None)
+def _js_hs_database():
+    """Hyperscan database for _JS_ALL_RES, compiled on first use (compiling costs a fraction of a second at import)"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.pattern.encode() for p in _JS_ALL_RES],
+            ids=list(range(len(_JS_ALL_RES))),
+            elements=len(_JS_ALL_RES),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(_JS_ALL_RES),
+        )
+    except Exception:
+        return None
+    return db
+
+@lru_cache(maxsize=None)
+def _lexer_name(file_name: str) -> Optional[str]:
+    """Pygments lexer name for a base name, or None if no lexer matches (each lookup scans
+    every lexer's patterns, so repeated names like __init__.py or index.js are resolved once)"""
+    try:
+        return get_lexer_for_filename(file_name).name
+    except ClassNotFound:
+        return None
+
+def _js_patterns_present(content: str) -> Set[re.Pattern]:
+    """Return the JS patterns that match somewhere in content"""
+    db = _js_hs_database()
+    if db is None:
+        return set(_JS_ALL_RES)
+    found = set()
+    db.scan(content.encode('utf-8'), match_event_handler=lambda pattern_id, *_: found.add(_JS_ALL_RES[pattern_id]))
+    return found
+
+# __slots__ dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FileInfo:
     """Information about a single file in the project"""
     path: str
@@ -62,7 +177,7 @@ class FileInfo:
     complexity_score: int
     summary: str
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProjectStructure:
     """Complete project analysis structure"""
     name: str
@@ -87,12 +202,97 @@ class ProjectStructure:
     security: Optional[Dict[str, Any]] = None
     ai_summaries: Optional[Dict[str, str]] = None
 
+class _FileColumns:
+    """Numeric FileInfo fields stored as NumPy columns (struct of arrays) for vectorized metric reductions"""
+
+    def __init__(self, capacity: int):
+        self.lines = np.empty(capacity, dtype=np.int64)
+        self.complexity = np.empty(capacity, dtype=np.int64)
+        self.functions = np.empty(capacity, dtype=np.int64)
+        self.classes = np.empty(capacity, dtype=np.int64)
+        self.language = np.empty(capacity, dtype=np.int32)
+        self.language_codes = {}  # language name -> code, in first-seen order
+        self.count = 0
+
+    def append(self, file_info: 'FileInfo'):
+        i = self.count
+        self.lines[i] = file_info.lines
+        self.complexity[i] = file_info.complexity_score
+        self.functions[i] = len(file_info.functions)
+        self.classes[i] = len(file_info.classes)
+        self.language[i] = self.language_codes.setdefault(file_info.language, len(self.language_codes))
+        self.count = i + 1
+
+def _reduce_metrics(lines, complexity, functions, classes):
+    return lines.sum(), complexity.sum(), functions.sum(), classes.sum()
+
+@lru_cache(maxsize=None)
+def _metrics_reducer():
+    """_reduce_metrics JIT-compiled with numba when installed (imported here; numba is slow to import)"""
+    try:
+        import numba
+    except ImportError:
+        return _reduce_metrics
+    # Compiled once and cached on disk, so later runs skip the JIT step
+    return numba.njit(cache=True)(_reduce_metrics)
+
+class _PyAnalyzer(ast.NodeVisitor):
+    """Collect functions, classes, imports and the complexity score in a single AST traversal"""
+
+    def __init__(self):
+        self.functions = []  # (tree depth, name)
+        self.classes = []    # (tree depth, name)
+        self.imports = set()
+        self.complexity = 1
+        self._depth = 0
+        self._function_depth = 0
+
+    @staticmethod
+    def ordered(entries) -> List[str]:
+        # Stable sort by depth turns depth-first order into ast.walk's breadth-first order
+        return [name for _, name in sorted(entries, key=lambda entry: entry[0])]
+
+    def generic_visit(self, node):
+        self._depth += 1
+        super().generic_visit(node)
+        self._depth -= 1
+
+    def visit_FunctionDef(self, node):
+        self.functions.append((self._depth, node.name))
+        self._function_depth += 1
+        self.generic_visit(node)
+        self._function_depth -= 1
+
+    def visit_ClassDef(self, node):
+        self.classes.append((self._depth, node.name))
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        self.imports.update(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node):
+        self.imports.add(node.module or '')
+
+    def _visit_branch(self, node):
+        # Simple complexity: each If/For/While counts once per enclosing function
+        self.complexity += self._function_depth
+        self.generic_visit(node)
+
+    visit_If = visit_For = visit_While = _visit_branch
+
 class CodeAnalyzer:
     """Core code analysis engine"""
 
+    # Directory names whose subtrees are never entered (hidden directories are skipped too)
+    IGNORE_DIRS = frozenset({
+        'node_modules', '__pycache__', '.git', 'venv', 'env',
+        'dist', 'build', 'target', '.pytest_cache'
+    })
+
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
         self.project_structure = None
+        self._file_index = None
         self.supported_extensions = {
             '.py': 'Python',
             '.js': 'JavaScript',
@@ -149,8 +349,7 @@ class CodeAnalyzer:
     def _analyze_package_json(self, path: Path) -> Dict[str, Any]:
         """Analyze Node.js package.json"""
         try:
-            with open(path) as f:
-                data = json.load(f)
+            data = _read_json(path)
 
             project_type = 'Node.js'
             framework = None
@@ -174,7 +373,7 @@ class CodeAnalyzer:
                 framework = 'Next.js'
 
             # Check for TypeScript
-            if 'typescript' in deps or any(f.suffix == '.ts' for f in self.project_path.rglob('*.ts')):
+            if 'typescript' in deps or any(f.suffix == '.ts' for f in self._walk_project()):
                 languages.append('TypeScript')
 
             entry_points = []
@@ -286,17 +485,14 @@ class CodeAnalyzer:
 
     def _analyze_by_extensions(self) -> Dict[str, Any]:
         """Fallback analysis by file extensions"""
-        extension_count = defaultdict(int)
-
-        for file_path in self.project_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in self.supported_extensions:
-                extension_count[file_path.suffix] += 1
+        # The cached walk only holds files with supported extensions
+        extension_count = Counter(file_path.suffix for file_path in self._walk_project())
 
         if not extension_count:
             return {'type': 'Unknown', 'languages': []}
 
         # Find most common language
-        primary_ext = max(extension_count.items(), key=lambda x: x[1])[0]
+        primary_ext = extension_count.most_common(1)[0][0]
         primary_lang = self.supported_extensions[primary_ext]
 
         return {
@@ -316,31 +512,39 @@ class CodeAnalyzer:
 
         return entry_points
 
-    def analyze_file(self, file_path: Path) -> Optional[FileInfo]:
-        """Analyze a single file"""
+    def analyze_file(self, file_path: Path, source: Optional[bytes] = None) -> Optional[FileInfo]:
+        """Analyze a single file (source: already-read file bytes, if available)"""
         try:
             if not file_path.is_file():
                 return None
 
             # Get language
-            try:
-                lexer = get_lexer_for_filename(str(file_path))
-                language = lexer.name
-            except ClassNotFound:
+            language = _lexer_name(file_path.name)
+            if language is None:
                 ext = file_path.suffix
                 language = self.supported_extensions.get(ext, 'Unknown')
 
             # Read file content
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                if source is None:
+                    with open(file_path, 'rb') as f:
+                        if os.fstat(f.fileno()).st_size > MAX_FILE_BYTES:
+                            return None
+                        head = f.read(8)
+                        if head.startswith(_BINARY_MAGIC):
+                            return None
+                        source = head + f.read()
+                elif len(source) > MAX_FILE_BYTES or source.startswith(_BINARY_MAGIC):
+                    return None
+                content = source.decode('utf-8')
             except UnicodeDecodeError:
                 # Skip binary files
                 return None
 
             # Basic metrics
-            lines = len(content.splitlines())
-            size = len(content.encode('utf-8'))
+            # Count newlines in the raw bytes instead of building a list of line strings
+            lines = source.count(b'\n') + (1 if source and not source.endswith(b'\n') else 0)
+            size = len(source)
 
             # Language-specific analysis
             functions = []
@@ -384,29 +588,14 @@ class CodeAnalyzer:
         try:
             tree = ast.parse(content)
 
-            functions = []
-            classes = []
-            imports = []
-            complexity_score = 1
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-                    # Simple complexity: count nested structures
-                    complexity_score += sum(1 for _ in ast.walk(node) if isinstance(_, (ast.If, ast.For, ast.While)))
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        imports.extend([alias.name for alias in node.names])
-                    else:
-                        imports.append(node.module or '')
+            analyzer = _PyAnalyzer()
+            analyzer.visit(tree)
 
             return {
-                'functions': functions,
-                'classes': classes,
-                'imports': list(set(imports)),
-                'complexity': complexity_score
+                'functions': analyzer.ordered(analyzer.functions),
+                'classes': analyzer.ordered(analyzer.classes),
+                'imports': list(analyzer.imports),
+                'complexity': analyzer.complexity
             }
         except SyntaxError:
             return {'functions': [], 'classes': [], 'imports': [], 'complexity': 1}
@@ -414,39 +603,23 @@ class CodeAnalyzer:
     def _analyze_js_file(self, content: str) -> Dict[str, Any]:
         """Basic JavaScript/TypeScript analysis using regex"""
         # Simple regex-based analysis (for a production tool, use a proper parser)
+        present = _js_patterns_present(content)
+        functions = set()
+        for pattern in _JS_FUNC_RES:
+            if pattern in present:
+                functions.update(pattern.findall(content))
 
-        # Function patterns
-        func_patterns = [
-            r'function\s+(\w+)',
-            r'const\s+(\w+)\s*=\s*(?:async\s+)?\(',
-            r'let\s+(\w+)\s*=\s*(?:async\s+)?\(',
-            r'var\s+(\w+)\s*=\s*(?:async\s+)?\(',
-            r'(\w+):\s*(?:async\s+)?function',
-            r'(\w+)\s*=\s*(?:async\s+)?\('
-        ]
-
-        functions = []
-        for pattern in func_patterns:
-            functions.extend(re.findall(pattern, content))
-
-        # Class patterns
-        classes = re.findall(r'class\s+(\w+)', content)
-
-        # Import patterns
-        import_patterns = [
-            r'import.*from\s+[\'"]([^\'"]+)[\'"]',
-            r'import\s+[\'"]([^\'"]+)[\'"]',
-            r'require\([\'"]([^\'"]+)[\'"]\)'
-        ]
+        classes = set(_JS_CLASS_RE.findall(content)) if _JS_CLASS_RE in present else set()
 
-        imports = []
-        for pattern in import_patterns:
-            imports.extend(re.findall(pattern, content))
+        imports = set()
+        for pattern in _JS_IMPORT_RES:
+            if pattern in present:
+                imports.update(pattern.findall(content))
 
         return {
-            'functions': list(set(functions)),
-            'classes': list(set(classes)),
-            'imports': list(set(imports))
+            'functions': list(functions),
+            'classes': list(classes),
+            'imports': list(imports)
         }
 
     def _generate_file_summary(self, file_path: Path, language: str, functions: List[str], classes: List[str]) -> str:
@@ -477,6 +650,63 @@ class CodeAnalyzer:
 
         return ' '.join(parts)
 
+    def _analyze_files(self, all_files: List[Path], corpus: Corpus) -> Iterator[Optional[FileInfo]]:
+        """Iterate analyze_file results in input order, reusing cached results for unchanged files.
+        Cache lookups and worker start-up happen in this call rather than on first iteration, so the
+        caller can start threads (such as a progress bar's) afterwards"""
+        cache = get_cache()
+        # The analyzer version is part of the key, so a release that changes FileInfo recomputes everything
+        tool = f"{python_tool('analyze_file')}:{__version__}"
+        cached = [None] * len(all_files)
+        missing = []
+        for index, file_path in enumerate(all_files):
+            hit = cache.get(file_path, tool) if cache is not None else None
+            if hit is None:
+                missing.append(file_path)
+            else:
+                # The stored path is relative to whichever root analyzed the file first
+                hit['path'] = str(file_path.relative_to(self.project_path))
+                cached[index] = FileInfo(**hit)
+        computed = self._compute_file_infos(missing, corpus)
+
+        def merge():
+            try:
+                for file_path, file_info in zip(all_files, cached):
+                    if file_info is None:
+                        file_info = next(computed)
+                        if file_info is not None and cache is not None:
+                            cache.put(file_path, tool, asdict(file_info), commit=False)
+                    yield file_info
+            finally:
+                # Also runs when the caller stops iterating early or the generator is closed
+                computed.close()
+                if cache is not None:
+                    cache.commit()
+
+        return merge()
+
+    def _compute_file_infos(self, files: List[Path], corpus: Corpus) -> Iterator[Optional[FileInfo]]:
+        """Iterate analyze_file results in input order, using worker processes for large projects.
+        The workers are forked in this call, before the caller starts any thread"""
+        if not use_process_pool(len(files), PARALLEL_MIN_FILES):
+            return (self.analyze_file(file_path, corpus.source(file_path)) for file_path in files)
+        items = [(file_path, corpus.source(file_path)) for file_path in files]
+        if any(self.supported_extensions.get(file_path.suffix) in ('JavaScript', 'TypeScript') for file_path in files):
+            # Compile before the workers start so forked workers inherit it instead of each compiling
+            _js_hs_database()
+        ex = ProcessPoolExecutor(max_workers=process_workers(), initializer=_init_analyzer_worker,
+                                 initargs=(type(self), str(self.project_path)))
+        # map submits every item now, which starts the worker processes
+        results = ex.map(_analyze_file_worker, items, chunksize=16)
+
+        def drain():
+            try:
+                yield from results
+            finally:
+                ex.shutdown(cancel_futures=True)
+
+        return drain()
+
     def analyze_project(self, ai_api_key: str = None, enable_complexity: bool = False) -> ProjectStructure:
         """Perform complete project analysis"""
         print("🔍 Starting project analysis...")
@@ -489,15 +719,28 @@ class CodeAnalyzer:
 
         # Analyze all files with progress bar
         files = []
+        py_files = []
+        js_files = []
         file_count = 0
-        all_files = [f for f in self.project_path.rglob('*') if self._should_analyze_file(f)]
-        with Progress() as progress:
+        all_files = self._walk_project()
+        columns = _FileColumns(len(all_files)) if np is not None else None
+        # Read every file once; the bytes are shared by all in-process analysis passes
+        corpus = Corpus.load(all_files, max_bytes=MAX_FILE_BYTES)
+        # Started before the progress bar: forking worker processes once its refresh thread runs is unsafe.
+        # closing() ends the iteration (and commits its cache writes) as soon as the loop is done
+        with closing(self._analyze_files(all_files, corpus)) as file_infos, Progress() as progress:
             task = progress.add_task("[cyan]Analyzing files...", total=len(all_files))
-            for file_path in all_files:
-                file_info = self.analyze_file(file_path)
+            for file_path, file_info in zip(all_files, file_infos):
                 if file_info:
                     files.append(file_info)
                     file_count += 1
+                    if columns is not None:
+                        columns.append(file_info)
+                    # Partition by language in the same pass
+                    if file_info.language == 'Python':
+                        py_files.append(file_path)
+                    elif file_info.language in ('JavaScript', 'TypeScript'):
+                        js_files.append(file_path)
                 progress.update(task, advance=1, description=f"[cyan]Analyzing: {file_path.name}")
         print(f"✓ Analyzed {file_count} files")
 
@@ -506,7 +749,7 @@ class CodeAnalyzer:
         # Categorize architecture
         architecture = self._categorize_architecture(files)
         # Calculate metrics
-        metrics = self._calculate_metrics(files)
+        metrics = self._calculate_metrics(files, columns)
         # NEW: Build dependency graph
         file_dependency_graph = self._build_file_dependency_graph(files)
         # === تحليل التغطية ===
@@ -514,20 +757,19 @@ class CodeAnalyzer:
         coverage_data = parse_coverage_xml(coverage_xml)
         overall_coverage = get_overall_coverage(coverage_data) if coverage_data else None
         # === تحليل linting ===
-        py_files = [self.project_path / f.path for f in files if f.language == 'Python']
         linting_results = run_pylint_on_files(py_files) if py_files else None
         # === تحليل call graph ===
-        call_graph = extract_call_graph(py_files)
+        call_graph = extract_call_graph(corpus)
         save_call_graph_mermaid(call_graph, self.project_path / 'call-graph.mmd')
-        cycles = find_cycles(call_graph)
+        cycles = all_cycles(call_graph, MAX_CYCLES)
+        if len(cycles) >= MAX_CYCLES:
+            print(f"⚠ Call graph cycle listing stopped at {MAX_CYCLES} cycles; there may be more")
         # === اكتشاف الأطر ===
-        all_files = [self.project_path / f.path for f in files]
-        detected_frameworks = detect_frameworks(all_files)
+        detected_frameworks = detect_frameworks(corpus)
         # === إحصائيات git ===
         contributors = get_contributors(self.project_path)
         # === linting متعدد ===
         flake8_results = run_flake8_on_files(py_files)
-        js_files = [self.project_path / f.path for f in files if f.language in ['JavaScript', 'TypeScript']]
         eslint_results = run_eslint_on_files(js_files)
         # === تحليل التعقيد (radon) ===
         if enable_complexity and py_files:
@@ -539,14 +781,14 @@ class CodeAnalyzer:
                 task = progress.add_task("[magenta]Complexity analysis...", total=len(py_files))
                 complexity_results = {}
                 start = time.time()
-                for pyf in py_files:
-                    from complexity_support import analyze_complexity_with_radon
-                    res = analyze_complexity_with_radon([pyf])
-                    complexity_results.update(res)
-                    progress.update(task, advance=1, description=f"[magenta]Analyzing: {pyf.name}")
+                # Whole chunks per radon call; the progress bar advances per chunk
+                chunk_size = 50
+                for start_index in range(0, len(py_files), chunk_size):
+                    chunk = py_files[start_index:start_index + chunk_size]
+                    complexity_results.update(analyze_complexity_with_radon(chunk))
+                    progress.update(task, advance=len(chunk), description=f"[magenta]Analyzing: {chunk[-1].name}")
                 elapsed = time.time() - start
                 print(f"[green]✓ Complexity analysis done in {elapsed:.1f} seconds[/green]")
-            from complexity_support import analyze_maintainability_with_radon
             maintainability_results = analyze_maintainability_with_radon(py_files)
         else:
             complexity_results = None
@@ -556,8 +798,10 @@ class CodeAnalyzer:
         # === تلخيص ذكي (اختياري) ===
         ai_summaries = {}
         if ai_api_key:
-            for file in py_files:
-                ai_summaries[str(file)] = ai_summarize_code(file, ai_api_key)
+            # Imported here: the openai client is slow to import and only needed with an API key
+            from ai_summarization_support import ai_summarize_code_batch
+            # Requests run concurrently (bounded by a semaphore) instead of one round-trip at a time
+            ai_summaries = ai_summarize_code_batch(py_files, ai_api_key)
         self.project_structure = ProjectStructure(
             name=self.project_path.name,
             type=project_info['type'],
@@ -583,19 +827,38 @@ class CodeAnalyzer:
         )
         return self.project_structure
 
+    def _walk_project(self) -> List[Path]:
+        """List the files to analyze with a single scandir traversal, cached for the analyzer's lifetime"""
+        if self._file_index is None:
+            files = []
+            stack = [self.project_path]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._is_ignored_dir(entry.name):
+                            subdirs.append(Path(entry.path))
+                    elif entry.is_file():
+                        path = Path(entry.path)
+                        if self._should_analyze_file(path):
+                            files.append(path)
+                # Same depth-first, directory-order traversal as Path.rglob
+                stack.extend(reversed(subdirs))
+            self._file_index = files
+        return self._file_index
+
+    def _is_ignored_dir(self, name: str) -> bool:
+        return name.startswith('.') or name in self.IGNORE_DIRS
+
     def _should_analyze_file(self, file_path: Path) -> bool:
         """Determine if file should be analyzed"""
-        # Skip hidden files and directories
-        if any(part.startswith('.') for part in file_path.parts):
-            return False
-
-        # Skip common ignore patterns
-        ignore_patterns = [
-            'node_modules', '__pycache__', '.git', 'venv', 'env',
-            'dist', 'build', 'target', '.pytest_cache'
-        ]
-
-        if any(pattern in str(file_path) for pattern in ignore_patterns):
+        # Skip hidden files (hidden and ignored directories are pruned by _walk_project)
+        if file_path.name.startswith('.'):
             return False
 
         # Only analyze supported file types
@@ -609,8 +872,7 @@ class CodeAnalyzer:
         package_json = self.project_path / 'package.json'
         if package_json.exists():
             try:
-                with open(package_json) as f:
-                    data = json.load(f)
+                data = _read_json(package_json)
                 deps['runtime'].extend(data.get('dependencies', {}).keys())
                 deps['development'].extend(data.get('devDependencies', {}).keys())
             except Exception:
@@ -665,17 +927,22 @@ class CodeAnalyzer:
 
         return categories
 
-    def _calculate_metrics(self, files: List[FileInfo]) -> Dict[str, Any]:
-        """Calculate project metrics"""
-        total_lines = sum(f.lines for f in files)
+    def _calculate_metrics(self, files: List[FileInfo], columns: Optional[_FileColumns] = None) -> Dict[str, Any]:
+        """Calculate project metrics (columns: the same files as NumPy columns, if collected)"""
+        if columns is not None:
+            return self._calculate_metrics_columns(columns)
+        # One pass over the files accumulates every total
         total_files = len(files)
-        total_functions = sum(len(f.functions) for f in files)
-        total_classes = sum(len(f.classes) for f in files)
-        avg_complexity = sum(f.complexity_score for f in files) / total_files if total_files > 0 else 0
-
-        language_distribution = defaultdict(int)
+        total_lines = total_functions = total_classes = total_complexity = 0
+        language_distribution = {}
         for file_info in files:
-            language_distribution[file_info.language] += file_info.lines
+            lines = file_info.lines
+            total_lines += lines
+            total_functions += len(file_info.functions)
+            total_classes += len(file_info.classes)
+            total_complexity += file_info.complexity_score
+            language_distribution[file_info.language] = language_distribution.get(file_info.language, 0) + lines
+        avg_complexity = total_complexity / total_files if total_files > 0 else 0
 
         return {
             'total_files': total_files,
@@ -686,23 +953,157 @@ class CodeAnalyzer:
             'language_distribution': dict(language_distribution)
         }
 
+    def _calculate_metrics_columns(self, columns: _FileColumns) -> Dict[str, Any]:
+        n = columns.count
+        total_lines, total_complexity, total_functions, total_classes = _metrics_reducer()(
+            columns.lines[:n], columns.complexity[:n], columns.functions[:n], columns.classes[:n])
+        # Lines per language in one weighted bincount, keys in first-seen order like the dict version
+        per_language = np.bincount(columns.language[:n], weights=columns.lines[:n],
+                                   minlength=len(columns.language_codes))
+        return {
+            'total_files': n,
+            'total_lines': int(total_lines),
+            'total_functions': int(total_functions),
+            'total_classes': int(total_classes),
+            'average_complexity': round(int(total_complexity) / n if n > 0 else 0, 2),
+            'language_distribution': {language: int(per_language[code])
+                                      for language, code in columns.language_codes.items()}
+        }
+
     def _build_file_dependency_graph(self, files: List[FileInfo]) -> Dict[str, List[str]]:
         """بناء رسم علاقات الاستيراد بين الملفات (dependency graph)"""
         # فقط للملفات التي تم تحليلها
-        file_map = {f.path: f for f in files}
-        dep_graph = {f.path: [] for f in files}
-        # ابحث عن كل import يشير إلى ملف آخر في المشروع
-        for file in files:
-            for imp in file.imports:
-                # ابحث عن ملف يحمل نفس اسم import (بدون الامتداد)
-                for other in files:
-                    if other is file:
-                        continue
-                    # Python: import mymodule -> mymodule.py
-                    if imp == Path(other.path).stem or imp == other.path.replace("/", ".").rsplit(".", 1)[0]:
-                        dep_graph[file.path].append(other.path)
+        # فهرس: اسم الاستيراد -> أرقام الملفات التي يشير إليها (بنفس ترتيب الملفات)
+        # Python: import mymodule -> mymodule.py أو import pkg.mymodule -> pkg/mymodule.py
+        targets = defaultdict(list)
+        for index, other in enumerate(files):
+            stem = Path(other.path).stem
+            module = other.path.replace("/", ".").rsplit(".", 1)[0]
+            targets[stem].append(index)
+            if module != stem:
+                targets[module].append(index)
+        dep_graph = {}
+        # كل import يُبحث عنه في الفهرس مباشرة بدل المرور على كل الملفات
+        for index, file in enumerate(files):
+            dep_graph[file.path] = [files[other].path for imp in file.imports
+                                    for other in targets.get(imp, ()) if other != index]
         return dep_graph
 
+# Each worker process builds its own analyzer once, so only (path, bytes) pairs cross the process boundary
+_worker_analyzer = None
+
+def _init_analyzer_worker(analyzer_cls: type, project_path: str):
+    global _worker_analyzer
+    _worker_analyzer = analyzer_cls(project_path)
+
+def _analyze_file_worker(item) -> Optional[FileInfo]:
+    file_path, source = item
+    return _worker_analyzer.analyze_file(file_path, source)
+
+def _extract_doc_items(file_path: Path):
+    """UML classes, usage examples and (for long files) the summary of one Python file, from a single
+    read and parse; returns plain tuples and strings so results from worker processes are cheap to
+    pickle (unlike AST nodes)"""
+    try:
+        source = get_source(file_path)
+    except OSError:
+        return [], [], None
+    tree = parse_source(source, file_path)
+    classes, examples = ((collect_classes(tree), extract_usage_examples(file_path, tree))
+                         if tree is not None else ([], []))
+    # Same line count as analyze_file, so the summary exists exactly when generate_file_summaries wants it
+    lines = source.count(b'\n') + (1 if source and not source.endswith(b'\n') else 0)
+    return classes, examples, summarize_source(source) if lines > SUMMARY_MIN_LINES else None
+
+def _extract_doc_items_batch(py_files: List[Path]) -> Dict[str, Any]:
+    if not use_process_pool(len(py_files), PARALLEL_MIN_FILES):
+        results = [_extract_doc_items(file_path) for file_path in py_files]
+    else:
+        with ProcessPoolExecutor(max_workers=process_workers()) as ex:
+            results = list(ex.map(_extract_doc_items, py_files, chunksize=32))
+    return {str(file_path): result for file_path, result in zip(py_files, results)}
+
+# Short (readme structure) and long (reports and prompts) descriptions of the architecture categories
+_CATEGORY_INFO = {
+    'Models': ('Data models and schemas', 'Data models, schemas, and database entities'),
+    'Controllers': ('Request handlers and route controllers', 'Request handlers, route controllers, and API endpoints'),
+    'Views': ('UI components and templates', 'UI components, templates, and presentation layer'),
+    'Services': ('Business logic and services', 'Business logic, services, and core functionality'),
+    'Utils': ('Utility functions and helpers', 'Utility functions, helpers, and common tools'),
+    'Tests': ('Test suites and specifications', 'Test suites, unit tests, and testing utilities'),
+    'Config': ('Configuration files', 'Configuration files and environment settings'),
+    'Other': ('Other project files', 'Miscellaneous files and additional components')
+}
+_DEFAULT_CATEGORY_INFO = ('Other project files', 'Project files')
+
+# mermaid-cli, resolved once; PNG rendering is skipped when it is not installed
+_MMDC_PATH = shutil.which('mmdc')
+
+# Styled Mermaid labels of the categories that have a classDef in the architecture diagram
+_CATEGORY_MERMAID_LABELS = {
+    'Controllers': '[Controllers]:::controller',
+    'Models': '[Models]:::model',
+    'Views': '[Views]:::view',
+    'Services': '[Services]:::service'
+}
+
+# Path characters that are not valid in Mermaid node ids
+_MERMAID_ID_TRANS = str.maketrans('/.', '__')
+
+# Static tail of the enhanced README
+_README_FOOTER = """## 🤝 Contributing
+1. Fork the repository
+2. Create a feature branch (`git checkout -b feature/amazing-feature`)
+3. Commit your changes (`git commit -m 'Add amazing feature'`)
+4. Push to the branch (`git push origin feature/amazing-feature`)
+5. Open a Pull Request
+
+## 📄 License
+This project is licensed under the MIT License - see the [LICENSE](LICENSE) file for details.
+
+---
+*This README was auto-generated by SmartRepo*
+"""
+
+# Layout of prompt-ready.md; generate_prompt_ready only supplies the fields
+_PROMPT_READY_TEMPLATE = """# AI-Ready Project Analysis: {name}
+
+## Quick Summary
+This is a {type} project with {total_files} files and {total_lines:,} lines of code across {language_count} programming languages.
+
+## Project Context
+**Type**: {type}
+**Languages**: {languages}
+**Entry Points**: {entry_points}
+
+## Architecture Overview
+{architecture}
+
+## Key Components
+{components}
+
+## Code Characteristics
+- **Complexity Level**: {complexity_level}
+- **Total Functions**: {total_functions}
+- **Total Classes**: {total_classes}
+- **Testing**: {testing}
+
+## Dependencies Context
+{dependencies}
+
+## File Structure Summary
+{file_structure}
+
+## Development Insights
+{insights}
+
+## Language Distribution
+{language_distribution}
+
+---
+*This analysis provides AI-ready context for understanding, documenting, or extending this codebase.*
+"""
+
 class DocumentationGenerator:
     """Generates enhanced documentation and visualizations"""
 
@@ -710,19 +1111,44 @@ class DocumentationGenerator:
         self.structure = project_structure
         self.output_dir = output_dir
         self.output_dir.mkdir(exist_ok=True)
+        # Python sources used by several generators, collected once
+        self._py_files = [self.output_dir.parent / f.path for f in self.structure.files if f.language == 'Python']
+        # Languages by line count as (language, lines, percentage), and non-empty categories
+        # as (category, files, count); shared by the readme, prompt and diagram generators
+        distribution = self.structure.metrics['language_distribution']
+        total_lines = sum(distribution.values())
+        self._lang_sorted = sorted(
+            ((lang, lines, (lines / total_lines * 100) if total_lines > 0 else 0)
+             for lang, lines in distribution.items()),
+            key=lambda t: t[1], reverse=True)
+        self._arch_nonempty = [(category, files, len(files))
+                               for category, files in self.structure.architecture.items() if files]
+        # Base names of the categorized files, for the tree, diagram and prompt listings
+        self._basename = {file_path: os.path.basename(file_path)
+                          for _, files, _ in self._arch_nonempty for file_path in files}
 
     def generate_all(self):
         """Generate all documentation outputs"""
         print("📝 Generating documentation...")
 
-        self.generate_enhanced_readme()
-        self.generate_architecture_diagram()
-        self.generate_file_dependency_diagram()
-        self.generate_ai_summary()
-        self.generate_prompt_ready()
-        self.generate_uml_diagram()
-        self.generate_usage_examples_file()
-        self.generate_file_summaries()
+        # Parse before any generator thread starts: forking worker processes from a threaded process is unsafe
+        self._py_doc_items
+
+        # The generators only read self.structure and write separate files, so run them together
+        generators = (
+            self.generate_enhanced_readme,
+            self.generate_architecture_diagram,
+            self.generate_file_dependency_diagram,
+            self.generate_ai_summary,
+            self.generate_prompt_ready,
+            self.generate_uml_diagram,
+            self.generate_usage_examples_file,
+            self.generate_file_summaries,
+        )
+        with ThreadPoolExecutor(max_workers=len(generators)) as ex:
+            futures = [ex.submit(generate) for generate in generators]
+            for future in futures:
+                future.result()
         print(self._generate_code_quality_section())
         print("✅ Documentation generation complete!")
         print(f"📁 Output files saved to: {self.output_dir}")
@@ -732,6 +1158,8 @@ class DocumentationGenerator:
             with open(self.output_dir / 'call-graph-cycles.txt', 'w', encoding='utf-8') as f:
                 for cycle in self.structure.call_graph_cycles:
                     f.write(' -> '.join(cycle) + '\n')
+                if len(self.structure.call_graph_cycles) >= MAX_CYCLES:
+                    f.write(f"... (listing stopped at {MAX_CYCLES} cycles; there may be more)\n")
         # إضافة contributors
         if hasattr(self.structure, 'contributors'):
             with open(self.output_dir / 'contributors.txt', 'w', encoding='utf-8') as f:
@@ -739,27 +1167,21 @@ class DocumentationGenerator:
                     f.write(f"{c['name']}: {c['commits']} commits\n")
         # إضافة linting متعدد
         if hasattr(self.structure, 'flake8'):
-            with open(self.output_dir / 'flake8-linting.json', 'w', encoding='utf-8') as f:
-                import json; f.write(json.dumps(self.structure.flake8, ensure_ascii=False, indent=2))
+            _write_json(self.output_dir / 'flake8-linting.json', self.structure.flake8)
         if hasattr(self.structure, 'eslint'):
-            with open(self.output_dir / 'eslint-linting.json', 'w', encoding='utf-8') as f:
-                import json; f.write(json.dumps(self.structure.eslint, ensure_ascii=False, indent=2))
+            _write_json(self.output_dir / 'eslint-linting.json', self.structure.eslint)
         # إضافة توصيات ذكية
-        from recommendation_support import generate_recommendations
-        recs = generate_recommendations(self.structure.metrics, self.structure.overall_coverage, len(self.structure.linting) if self.structure.linting else 0)
+        recs = iter_recommendations(self.structure.metrics, self.structure.overall_coverage, len(self.structure.linting) if self.structure.linting else 0)
         with open(self.output_dir / 'recommendations.txt', 'w', encoding='utf-8') as f:
             for r in recs:
                 f.write(r + '\n')
         # إضافة تقارير التعقيد والأمان والتلخيص الذكي
         if hasattr(self.structure, 'complexity'):
-            with open(self.output_dir / 'complexity_report.json', 'w', encoding='utf-8') as f:
-                import json; f.write(json.dumps(self.structure.complexity, ensure_ascii=False, indent=2))
+            _write_json(self.output_dir / 'complexity_report.json', self.structure.complexity)
         if hasattr(self.structure, 'maintainability'):
-            with open(self.output_dir / 'maintainability_report.json', 'w', encoding='utf-8') as f:
-                import json; f.write(json.dumps(self.structure.maintainability, ensure_ascii=False, indent=2))
+            _write_json(self.output_dir / 'maintainability_report.json', self.structure.maintainability)
         if hasattr(self.structure, 'security'):
-            with open(self.output_dir / 'security_report.json', 'w', encoding='utf-8') as f:
-                import json; f.write(json.dumps(self.structure.security, ensure_ascii=False, indent=2))
+            _write_json(self.output_dir / 'security_report.json', self.structure.security)
         if hasattr(self.structure, 'ai_summaries') and self.structure.ai_summaries:
             with open(self.output_dir / 'ai_summaries.txt', 'w', encoding='utf-8') as f:
                 for file, summary in self.structure.ai_summaries.items():
@@ -767,67 +1189,50 @@ class DocumentationGenerator:
 
     def generate_enhanced_readme(self):
         """Generate enhanced README.md"""
-        coverage_str = f"{self.structure.overall_coverage:.1f}%" if self.structure.overall_coverage is not None else "Not available"
-        linting_str = str(len(self.structure.linting)) if self.structure.linting else "0"
-        readme_content = f"""# {self.structure.name}
-
-## 🚀 Overview
-{self._generate_project_description()}
-
-## 📊 Project Statistics
-- **Type**: {self.structure.type}
-- **Languages**: {', '.join(self.structure.languages)}
-- **Total Files**: {self.structure.metrics['total_files']}
-- **Total Lines**: {self.structure.metrics['total_lines']:,}
-- **Functions**: {self.structure.metrics['total_functions']}
-- **Classes**: {self.structure.metrics['total_classes']}
-- **Coverage**: {coverage_str}\n- **Linting Issues**: {linting_str}\n
-## 🏗️ Architecture
-
-```
-{self._generate_architecture_tree()}
-```
-
-### 📂 Project Structure
-{self._generate_structure_description()}
-
-## 🔧 Dependencies
-{self._generate_dependencies_section()}
-
-## 🚀 Getting Started
-
-### Prerequisites
-{self._generate_prerequisites()}
-
-### Installation
-{self._generate_installation_steps()}
-
-### Usage
-{self._generate_usage_examples()}
-
-## 📈 Code Metrics
-- **Average Complexity**: {self.structure.metrics['average_complexity']}
-- **Language Distribution**:
-{self._format_language_distribution()}
-
-## 🤝 Contributing
-1. Fork the repository
-2. Create a feature branch (`git checkout -b feature/amazing-feature`)
-3. Commit your changes (`git commit -m 'Add amazing feature'`)
-4. Push to the branch (`git push origin feature/amazing-feature`)
-5. Open a Pull Request
-
-## 📄 License
-This project is licensed under the MIT License - see the [LICENSE](LICENSE) file for details.
-
----
-*This README was auto-generated by SmartRepo*
-"""
+        structure = self.structure
+        metrics = structure.metrics
+        coverage_str = f"{structure.overall_coverage:.1f}%" if structure.overall_coverage is not None else "Not available"
+        linting_str = str(len(structure.linting)) if structure.linting else "0"
+        # Render the sections up front so a failing helper surfaces before the file is opened
+        description = self._project_description
+        architecture_tree = self._architecture_tree
+        structure_description = self._generate_structure_description()
+        dependencies = self._generate_dependencies_section()
+        prerequisites = self._generate_prerequisites()
+        installation = self._generate_installation_steps()
+        usage = self._generate_usage_examples()
+        language_distribution = self._language_distribution
+
+        parts = [
+            "# ", structure.name, "\n\n",
+            "## 🚀 Overview\n", description, "\n\n",
+            "## 📊 Project Statistics\n",
+            "- **Type**: ", structure.type, "\n",
+            "- **Languages**: ", ', '.join(structure.languages), "\n",
+            "- **Total Files**: ", str(metrics['total_files']), "\n",
+            "- **Total Lines**: ", f"{metrics['total_lines']:,}", "\n",
+            "- **Functions**: ", str(metrics['total_functions']), "\n",
+            "- **Classes**: ", str(metrics['total_classes']), "\n",
+            "- **Coverage**: ", coverage_str, "\n",
+            "- **Linting Issues**: ", linting_str, "\n\n",
+            "## 🏗️ Architecture\n\n```\n", architecture_tree, "\n```\n\n",
+            "### 📂 Project Structure\n", structure_description, "\n\n",
+            "## 🔧 Dependencies\n", dependencies, "\n\n",
+            "## 🚀 Getting Started\n\n",
+            "### Prerequisites\n", prerequisites, "\n\n",
+            "### Installation\n", installation, "\n\n",
+            "### Usage\n", usage, "\n\n",
+            "## 📈 Code Metrics\n",
+            "- **Average Complexity**: ", str(metrics['average_complexity']), "\n",
+            "- **Language Distribution**:\n", language_distribution, "\n\n",
+            _README_FOOTER,
+        ]
 
-        with open(self.output_dir / 'readme-enhanced.md', 'w') as f:
-            f.write(readme_content)
+        with _open_buffered(self.output_dir / 'readme-enhanced.md') as f:
+            f.writelines(parts)
 
-    def _generate_project_description(self) -> str:
+    @cached_property
+    def _project_description(self) -> str:
         """Generate intelligent project description"""
         desc_parts = []
 
@@ -854,64 +1259,48 @@ This project is licensed under the MIT License - see the [LICENSE](LICENSE) file
 
         return '. '.join(desc_parts) + '.'
 
-    def _generate_architecture_tree(self) -> str:
+    @cached_property
+    def _architecture_tree(self) -> str:
         """Generate ASCII tree of project structure"""
         tree_lines = []
+        append = tree_lines.append
+        basename = self._basename
 
-        for category, files in self.structure.architecture.items():
-            if files:
-                tree_lines.append(f"├── {category}/")
-                for i, file_path in enumerate(files):  # عرض كل الملفات
-                    prefix = "│   ├──" if i < len(files) - 1 else "│   └──"
-                    tree_lines.append(f"{prefix} {Path(file_path).name}")
+        for category, files, count in self._arch_nonempty:
+            append(f"├── {category}/")
+            last = count - 1
+            for i, file_path in enumerate(files):  # عرض كل الملفات
+                append(f"{'│   └──' if i == last else '│   ├──'} {basename[file_path]}")
 
         return '\n'.join(tree_lines)
 
     def _generate_structure_description(self) -> str:
         """Generate structure description"""
-        descriptions = []
-
-        for category, files in self.structure.architecture.items():
-            if files:
-                count = len(files)
-                if category == 'Models':
-                    descriptions.append(f"- **{category}** ({count} files): Data models and schemas")
-                elif category == 'Controllers':
-                    descriptions.append(f"- **{category}** ({count} files): Request handlers and route controllers")
-                elif category == 'Views':
-                    descriptions.append(f"- **{category}** ({count} files): UI components and templates")
-                elif category == 'Services':
-                    descriptions.append(f"- **{category}** ({count} files): Business logic and services")
-                elif category == 'Utils':
-                    descriptions.append(f"- **{category}** ({count} files): Utility functions and helpers")
-                elif category == 'Tests':
-                    descriptions.append(f"- **{category}** ({count} files): Test suites and specifications")
-                elif category == 'Config':
-                    descriptions.append(f"- **{category}** ({count} files): Configuration files")
-                else:
-                    descriptions.append(f"- **{category}** ({count} files): Other project files")
-
-        return '\n'.join(descriptions)
+        return '\n'.join(
+            f"- **{category}** ({count} files): {_CATEGORY_INFO.get(category, _DEFAULT_CATEGORY_INFO)[0]}"
+            for category, _, count in self._arch_nonempty
+        )
 
     def _generate_dependencies_section(self) -> str:
         """Generate dependencies section"""
+        deps = self.structure.dependencies
         sections = []
 
-        if self.structure.dependencies['runtime']:
+        if deps['runtime']:
             sections.append("### Runtime Dependencies")
-            runtime_deps = self.structure.dependencies['runtime'][:10]  # Show first 10
+            runtime_deps = deps['runtime'][:10]  # Show first 10
             for dep in runtime_deps:
                 sections.append(f"- `{dep}`")
-            if len(self.structure.dependencies['runtime']) > 10:
-                sections.append(f"- ... and {len(self.structure.dependencies['runtime']) - 10} more")
+            if len(deps['runtime']) > 10:
+                sections.append(f"- ... and {len(deps['runtime']) - 10} more")
 
-        if self.structure.dependencies['development']:
+        if deps['development']:
             sections.append("\n### Development Dependencies")
-            dev_deps = self.structure.dependencies['development'][:10]
+            dev_deps = deps['development'][:10]
             for dep in dev_deps:
                 sections.append(f"- `{dep}`")
-            if len(self.structure.dependencies['development']) > 10:
-                sections.append(f"- ... and {len(self.structure.dependencies['development']) - 10} more")
+            if len(deps['development']) > 10:
+                sections.append(f"- ... and {len(deps['development']) - 10} more")
 
         return '\n'.join(sections) if sections else "No dependencies detected."
 
@@ -984,86 +1373,70 @@ This project is licensed under the MIT License - see the [LICENSE](LICENSE) file
         examples.append("```")
         return '\n'.join(examples)
 
-    def _format_language_distribution(self) -> str:
+    @cached_property
+    def _language_distribution(self) -> str:
         """Format language distribution"""
-        total_lines = sum(self.structure.metrics['language_distribution'].values())
         lines = []
 
-        for lang, line_count in sorted(self.structure.metrics['language_distribution'].items(),
-                                     key=lambda x: x[1], reverse=True):
-            percentage = (line_count / total_lines * 100) if total_lines > 0 else 0
+        for lang, line_count, percentage in self._lang_sorted:
             lines.append(f"  - **{lang}**: {line_count:,} lines ({percentage:.1f}%)")
 
         return '\n'.join(lines)
 
     def generate_architecture_diagram(self):
         """Generate Mermaid architecture diagram"""
-        mermaid_content = self._generate_mermaid_diagram()
-
-        with open(self.output_dir / 'architecture.mmd', 'w') as f:
-            f.write(mermaid_content)
+        with _open_buffered(self.output_dir / 'architecture.mmd') as f:
+            f.write('\n'.join(self._iter_mermaid_lines()))
 
         # Try to generate PNG if mermaid-cli is available
         self._generate_diagram_png()
 
-    def _generate_mermaid_diagram(self) -> str:
-        """Generate Mermaid diagram content"""
-        diagram_lines = ["graph TD"]
+    def _iter_mermaid_lines(self) -> Iterator[str]:
+        """Yield the Mermaid diagram content line by line"""
+        yield "graph TD"
 
         # Add main application node
-        diagram_lines.append(f"    APP[{self.structure.name}]")
+        yield f"    APP[{self.structure.name}]"
 
         # Add category nodes and connections
         node_id = 0
-        category_nodes = {}
 
-        for category, files in self.structure.architecture.items():
-            if files:
-                node_id += 1
-                category_node = f"CAT{node_id}"
-                category_nodes[category] = category_node
-
-                # Style based on category
-                if category == 'Controllers':
-                    diagram_lines.append(f"    {category_node}[{category}]:::controller")
-                elif category == 'Models':
-                    diagram_lines.append(f"    {category_node}[{category}]:::model")
-                elif category == 'Views':
-                    diagram_lines.append(f"    {category_node}[{category}]:::view")
-                elif category == 'Services':
-                    diagram_lines.append(f"    {category_node}[{category}]:::service")
-                else:
-                    diagram_lines.append(f"    {category_node}[{category}]")
+        for category, files, _ in self._arch_nonempty:
+            node_id += 1
+            category_node = f"CAT{node_id}"
 
-                diagram_lines.append(f"    APP --> {category_node}")
+            # Style based on category
+            label = _CATEGORY_MERMAID_LABELS.get(category) or f"[{category}]"
+            yield f"    {category_node}{label}"
 
-                # Add كل الملفات
-                for i, file_path in enumerate(files):
-                    node_id += 1
-                    file_node = f"FILE{node_id}"
-                    file_name = Path(file_path).name
-                    diagram_lines.append(f"    {file_node}[{file_name}]")
-                    diagram_lines.append(f"    {category_node} --> {file_node}")
+            yield f"    APP --> {category_node}"
 
-        # Add styling
-        diagram_lines.extend([
-            "",
-            "    classDef controller fill:#e1f5fe",
-            "    classDef model fill:#f3e5f5",
-            "    classDef view fill:#e8f5e8",
-            "    classDef service fill:#fff3e0"
-        ])
+            # Add كل الملفات
+            for file_path in files:
+                node_id += 1
+                file_node = f"FILE{node_id}"
+                file_name = self._basename[file_path]
+                yield f"    {file_node}[{file_name}]"
+                yield f"    {category_node} --> {file_node}"
 
-        return '\n'.join(diagram_lines)
+        # Add styling
+        yield ""
+        yield "    classDef controller fill:#e1f5fe"
+        yield "    classDef model fill:#f3e5f5"
+        yield "    classDef view fill:#e8f5e8"
+        yield "    classDef service fill:#fff3e0"
 
     def _generate_diagram_png(self):
         """Try to generate PNG from Mermaid (requires mermaid-cli)"""
+        if _MMDC_PATH is None:
+            print("⚠ Mermaid CLI not found. PNG generation skipped.")
+            return
         try:
             input_file = self.output_dir / 'architecture.mmd'
             output_file = self.output_dir / 'architecture.png'
 
             result = subprocess.run([
-                'mmdc', '-i', str(input_file), '-o', str(output_file),
+                _MMDC_PATH, '-i', str(input_file), '-o', str(output_file),
                 '-t', 'neutral', '-b', 'white'
             ], capture_output=True, text=True)
 
@@ -1080,38 +1453,40 @@ This project is licensed under the MIT License - see the [LICENSE](LICENSE) file
         if not dep_graph:
             print("لا يوجد رسم علاقات بين الملفات")
             return
+        # Each path is sanitized once, however many edges it appears in
+        node_ids = {path: sys.intern(path.translate(_MERMAID_ID_TRANS))
+                    for path in {*dep_graph, *(tgt for targets in dep_graph.values() for tgt in targets)}}
         lines = ["graph TD"]
         for src, targets in dep_graph.items():
-            src_node = src.replace("/", "_").replace(".", "_")
+            src_node = node_ids[src]
             if not targets:
                 lines.append(f"    {src_node}['{src}']")
             for tgt in targets:
-                tgt_node = tgt.replace("/", "_").replace(".", "_")
-                lines.append(f"    {src_node}['{src}'] --> {tgt_node}['{tgt}']")
-        with open(self.output_dir / 'file-dependency-graph.mmd', 'w') as f:
+                lines.append(f"    {src_node}['{src}'] --> {node_ids[tgt]}['{tgt}']")
+        with _open_buffered(self.output_dir / 'file-dependency-graph.mmd') as f:
             f.write('\n'.join(lines))
         print("✓ تم توليد مخطط علاقات الملفات: file-dependency-graph.mmd")
 
     def generate_ai_summary(self):
         """Generate AI-friendly JSON summary"""
+        structure = self.structure
         summary = {
             "project_overview": {
-                "name": self.structure.name,
-                "type": self.structure.type,
-                "languages": self.structure.languages,
-                "entry_points": self.structure.entry_points,
-                "description": self._generate_project_description()
+                "name": structure.name,
+                "type": structure.type,
+                "languages": structure.languages,
+                "entry_points": structure.entry_points,
+                "description": self._project_description
             },
-            "metrics": self.structure.metrics,
-            "dependencies": self.structure.dependencies,
+            "metrics": structure.metrics,
+            "dependencies": structure.dependencies,
             "architecture": {
                 category: {
-                    "file_count": len(files),
+                    "file_count": count,
                     "files": files,  # كل الملفات
                     "description": self._get_category_description(category)
                 }
-                for category, files in self.structure.architecture.items()
-                if files
+                for category, files, count in self._arch_nonempty
             },
             "file_summaries": [
                 {
@@ -1123,118 +1498,93 @@ This project is licensed under the MIT License - see the [LICENSE](LICENSE) file
                     "lines": file.lines,
                     "complexity": file.complexity_score
                 }
-                for file in sorted(self.structure.files, key=lambda x: x.lines, reverse=True)[:20]  # Top 20 files
+                for file in heapq.nlargest(20, structure.files, key=attrgetter('lines'))  # Top 20 files
             ],
-            "key_insights": self._generate_key_insights(),
+            "key_insights": self._key_insights,
             "generated_at": "2025-07-23T00:00:00Z",
             "analyzer_version": "1.0.0"
         }
 
-        with open(self.output_dir / 'ai-summary.json', 'w') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _write_json(self.output_dir / 'ai-summary.json', summary)
 
     def _get_category_description(self, category: str) -> str:
         """Get description for architecture category"""
-        descriptions = {
-            'Models': 'Data models, schemas, and database entities',
-            'Controllers': 'Request handlers, route controllers, and API endpoints',
-            'Views': 'UI components, templates, and presentation layer',
-            'Services': 'Business logic, services, and core functionality',
-            'Utils': 'Utility functions, helpers, and common tools',
-            'Tests': 'Test suites, unit tests, and testing utilities',
-            'Config': 'Configuration files and environment settings',
-            'Other': 'Miscellaneous files and additional components'
-        }
-        return descriptions.get(category, 'Project files')
+        return _CATEGORY_INFO.get(category, _DEFAULT_CATEGORY_INFO)[1]
 
-    def _generate_key_insights(self) -> List[str]:
+    @cached_property
+    def _key_insights(self) -> List[str]:
         """Generate key insights about the project"""
+        metrics = self.structure.metrics
+        arch = self.structure.architecture
         insights = []
 
         # Complexity insights
-        if self.structure.metrics['average_complexity'] > 5:
+        if metrics['average_complexity'] > 5:
             insights.append("High code complexity detected - consider refactoring for maintainability")
-        elif self.structure.metrics['average_complexity'] < 2:
+        elif metrics['average_complexity'] < 2:
             insights.append("Low complexity code - well-structured and maintainable")
 
         # Architecture insights
-        if self.structure.architecture['Tests']:
-            test_ratio = len(self.structure.architecture['Tests']) / self.structure.metrics['total_files']
+        if arch['Tests']:
+            test_ratio = len(arch['Tests']) / metrics['total_files']
             if test_ratio > 0.3:
                 insights.append("Good test coverage - testing is well-integrated")
             elif test_ratio < 0.1:
                 insights.append("Limited test files detected - consider improving test coverage")
 
-        if self.structure.architecture['Models'] and self.structure.architecture['Controllers']:
+        if arch['Models'] and arch['Controllers']:
             insights.append("Follows MVC-like architecture pattern")
 
-        if self.structure.architecture['Services']:
+        if arch['Services']:
             insights.append("Service-oriented architecture detected")
 
         # Language insights
-        lang_count = len(self.structure.metrics['language_distribution'])
+        lang_count = len(metrics['language_distribution'])
         if lang_count > 3:
             insights.append(f"Multi-language project ({lang_count} languages) - good for diverse functionality")
 
         # Size insights
-        if self.structure.metrics['total_lines'] > 10000:
+        if metrics['total_lines'] > 10000:
             insights.append("Large codebase - consider modularization strategies")
-        elif self.structure.metrics['total_lines'] < 1000:
+        elif metrics['total_lines'] < 1000:
             insights.append("Compact project - good for quick understanding and maintenance")
 
         return insights
 
     def generate_prompt_ready(self):
         """Generate prompt-ready documentation for AI consumption"""
-        content = f"""# AI-Ready Project Analysis: {self.structure.name}
-
-## Quick Summary
-This is a {self.structure.type} project with {self.structure.metrics['total_files']} files and {self.structure.metrics['total_lines']:,} lines of code across {len(self.structure.languages)} programming languages.
-
-## Project Context
-**Type**: {self.structure.type}
-**Languages**: {', '.join(self.structure.languages)}
-**Entry Points**: {', '.join(self.structure.entry_points) if self.structure.entry_points else 'Not specified'}
-
-## Architecture Overview
-{self._generate_architecture_prompt_section()}
-
-## Key Components
-{self._generate_components_prompt_section()}
-
-## Code Characteristics
-- **Complexity Level**: {'High' if self.structure.metrics['average_complexity'] > 5 else 'Medium' if self.structure.metrics['average_complexity'] > 3 else 'Low'}
-- **Total Functions**: {self.structure.metrics['total_functions']}
-- **Total Classes**: {self.structure.metrics['total_classes']}
-- **Testing**: {'Well-tested' if self.structure.architecture['Tests'] else 'Limited testing'}
-
-## Dependencies Context
-{self._generate_dependencies_prompt_section()}
-
-## File Structure Summary
-{self._generate_file_structure_prompt()}
-
-## Development Insights
-{chr(10).join(f'- {insight}' for insight in self._generate_key_insights())}
-
-## Language Distribution
-{self._generate_language_prompt_section()}
-
----
-*This analysis provides AI-ready context for understanding, documenting, or extending this codebase.*
-"""
+        structure = self.structure
+        metrics = structure.metrics
+        average_complexity = metrics['average_complexity']
+        content = _PROMPT_READY_TEMPLATE.format(
+            name=structure.name,
+            type=structure.type,
+            total_files=metrics['total_files'],
+            total_lines=metrics['total_lines'],
+            language_count=len(structure.languages),
+            languages=', '.join(structure.languages),
+            entry_points=', '.join(structure.entry_points) if structure.entry_points else 'Not specified',
+            architecture=self._generate_architecture_prompt_section(),
+            components=self._generate_components_prompt_section(),
+            complexity_level='High' if average_complexity > 5 else 'Medium' if average_complexity > 3 else 'Low',
+            total_functions=metrics['total_functions'],
+            total_classes=metrics['total_classes'],
+            testing='Well-tested' if structure.architecture['Tests'] else 'Limited testing',
+            dependencies=self._generate_dependencies_prompt_section(),
+            file_structure=self._generate_file_structure_prompt(),
+            insights='\n'.join(f'- {insight}' for insight in self._key_insights),
+            language_distribution=self._generate_language_prompt_section(),
+        )
 
-        with open(self.output_dir / 'prompt-ready.md', 'w') as f:
+        with _open_buffered(self.output_dir / 'prompt-ready.md') as f:
             f.write(content)
 
     def _generate_architecture_prompt_section(self) -> str:
         """Generate architecture section for prompts"""
         sections = []
 
-        for category, files in self.structure.architecture.items():
-            if files:
-                count = len(files)
-                sections.append(f"**{category}** ({count} files): {self._get_category_description(category)}")
+        for category, _, count in self._arch_nonempty:
+            sections.append(f"**{category}** ({count} files): {self._get_category_description(category)}")
 
         return '\n'.join(sections)
 
@@ -1243,8 +1593,8 @@ This is a {self.structure.type} project with {self.structure.metrics['total_file
         components = []
 
         # Get top files by different criteria
-        largest_files = sorted(self.structure.files, key=lambda x: x.lines, reverse=True)[:5]
-        most_complex = sorted(self.structure.files, key=lambda x: x.complexity_score, reverse=True)[:3]
+        largest_files = heapq.nlargest(5, self.structure.files, key=attrgetter('lines'))
+        most_complex = heapq.nlargest(3, self.structure.files, key=attrgetter('complexity_score'))
 
         components.append("**Largest Files**:")
         for file in largest_files:
@@ -1260,14 +1610,15 @@ This is a {self.structure.type} project with {self.structure.metrics['total_file
 
     def _generate_dependencies_prompt_section(self) -> str:
         """Generate dependencies section for prompts"""
+        deps = self.structure.dependencies
         sections = []
 
-        if self.structure.dependencies['runtime']:
-            key_deps = self.structure.dependencies['runtime'][:8]
+        if deps['runtime']:
+            key_deps = deps['runtime'][:8]
             sections.append(f"**Key Runtime Dependencies**: {', '.join(key_deps)}")
 
-        if self.structure.dependencies['development']:
-            dev_deps = self.structure.dependencies['development'][:5]
+        if deps['development']:
+            dev_deps = deps['development'][:5]
             sections.append(f"**Development Tools**: {', '.join(dev_deps)}")
 
         return '\n'.join(sections) if sections else "No major dependencies detected."
@@ -1276,23 +1627,19 @@ This is a {self.structure.type} project with {self.structure.metrics['total_file
         """Generate file structure for prompts"""
         structure = []
 
-        for category, files in self.structure.architecture.items():
-            if files:
-                structure.append(f"- **{category}**: {len(files)} files")
-                # Show a few example files
-                examples = [Path(f).name for f in files[:3]]
-                structure.append(f"  Examples: {', '.join(examples)}")
+        for category, files, count in self._arch_nonempty:
+            structure.append(f"- **{category}**: {count} files")
+            # Show a few example files
+            examples = [self._basename[f] for f in files[:3]]
+            structure.append(f"  Examples: {', '.join(examples)}")
 
         return '\n'.join(structure)
 
     def _generate_language_prompt_section(self) -> str:
         """Generate language distribution for prompts"""
-        total_lines = sum(self.structure.metrics['language_distribution'].values())
         sections = []
 
-        for lang, lines in sorted(self.structure.metrics['language_distribution'].items(),
-                                key=lambda x: x[1], reverse=True):
-            percentage = (lines / total_lines * 100) if total_lines > 0 else 0
+        for lang, lines, percentage in self._lang_sorted:
             sections.append(f"- **{lang}**: {percentage:.1f}% ({lines:,} lines)")
 
         return '\n'.join(sections)
@@ -1307,18 +1654,27 @@ This is a {self.structure.type} project with {self.structure.metrics['total_file
             lines.append(f"- **Linting Issues**: {len(issues)} (convention/error)")
         return '\n'.join(lines) if lines else "- No code quality data."
 
+    @cached_property
+    def _py_doc_items(self) -> List[tuple]:
+        """(classes, usage examples, summary) per Python file, read and parsed once for the UML,
+        usage-example and file-summary generators"""
+        py_files = self._py_files
+        # Unchanged files are served from the sqlite result cache, so re-runs only parse what changed
+        items = run_cached(python_tool('doc_items:3'), py_files, _extract_doc_items_batch)
+        return [items.get(str(file_path), ([], [], None)) for file_path in py_files]
+
     def generate_uml_diagram(self):
         """توليد مخطط UML class diagram وحفظه"""
-        py_files = [self.output_dir.parent / f.path for f in self.structure.files if f.language == 'Python']
+        py_files = self._py_files
         if py_files:
             output_path = self.output_dir / 'uml-class-diagram.mmd'
-            generate_mermaid_class_diagram(py_files, output_path)
+            generate_mermaid_class_diagram((cls for classes, _, _ in self._py_doc_items for cls in classes), output_path)
             print("✓ تم توليد مخطط UML class diagram")
     def generate_usage_examples_file(self):
         """توليد ملف أمثلة استخدام تلقائية"""
-        py_files = [self.output_dir.parent / f.path for f in self.structure.files if f.language == 'Python']
+        py_files = self._py_files
         if py_files:
-            examples = extract_usage_examples(py_files)
+            examples = [example for _, file_examples, _ in self._py_doc_items for example in file_examples]
             with open(self.output_dir / 'usage-examples.txt', 'w', encoding='utf-8') as f:
                 for ex in examples:
                     f.write(ex + '\n')
@@ -1327,21 +1683,55 @@ This is a {self.structure.type} project with {self.structure.metrics['total_file
         """تلخيص الملفات الكبيرة وحفظها"""
         # استخدم المسار الأصلي للمشروع
         project_root = self.output_dir.parent  # مجلد المشروع الأصلي
+        # الملفات التي تشترك في الاسم تكتب نفس ملف الملخص، ويبقى آخرها كما في التنفيذ التسلسلي
+        targets = {}
         for f in self.structure.files:
-            if f.lines > 100:
-                src_path = project_root / f.path
-                if src_path.exists():
-                    summary = summarize_file(src_path)
-                    with open(self.output_dir / f"summary_{Path(f.path).name}.txt", 'w', encoding='utf-8') as out:
-                        out.write(summary)
+            if f.lines > SUMMARY_MIN_LINES:
+                targets[f"summary_{Path(f.path).name}.txt"] = project_root / f.path
+        # Python summaries come with the doc items, from the same read as the UML and usage-example pass
+        py_summaries = {file_path: summary for file_path, (_, _, summary) in zip(self._py_files, self._py_doc_items)
+                        if summary is not None}
+
+        def summarize_one(item):
+            out_name, src_path = item
+            summary = py_summaries.get(src_path)
+            if summary is None:
+                if not src_path.exists():
+                    return
+                summary = summarize_file(src_path)
+            with _open_buffered(self.output_dir / out_name) as out:
+                out.write(summary)
+
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(32, len(targets), (os.cpu_count() or 1) * 4)) as ex:
+                list(ex.map(summarize_one, targets.items()))
         print("✓ تم تلخيص الملفات الكبيرة")
 
 
+def _init_subproject_worker():
+    # A connection inherited through fork must not be shared with the parent or the sibling processes
+    reset_cache()
+    # The subprojects already use one process per CPU; nested pools would only oversubscribe it
+    set_process_workers(1)
+    # Progress bars and messages from several workers would interleave; the parent prints each summary
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+def _analyze_one(sub_path: Path, out_path: Path, enable_complexity: bool) -> ProjectStructure:
+    """Analyze one monorepo subproject and write its documentation (may run in a worker process)"""
+    out_path.mkdir(parents=True, exist_ok=True)
+    analyzer = CodeAnalyzer(str(sub_path))
+    # One stat per file for all cached tools of this run
+    with stat_snapshot():
+        project_structure = analyzer.analyze_project(enable_complexity=enable_complexity)
+        doc_generator = DocumentationGenerator(project_structure, out_path)
+        doc_generator.generate_all()
+    return project_structure
+
 class SmartRepoAnalyzer:
     """Main application class"""
 
     def __init__(self):
-        self.version = "1.0.0"
+        self.version = __version__
         self.console = Console()
 
     def print_logo(self):
@@ -1385,24 +1775,33 @@ class SmartRepoAnalyzer:
             subprojects = find_subprojects(project_path)
             if subprojects:
                 print(f"🔎 Found {len(subprojects)} subprojects (monorepo mode)")
-                for sub in subprojects:
-                    print(f"\n=== Analyzing subproject: {sub} ===")
-                    sub_output = output_path / sub.name
-                    sub_output.mkdir(parents=True, exist_ok=True)
-                    analyzer = CodeAnalyzer(str(sub))
-                    project_structure = analyzer.analyze_project(enable_complexity=enable_complexity)
-                    doc_generator = DocumentationGenerator(project_structure, sub_output)
-                    doc_generator.generate_all()
-                    self._print_summary(project_structure, sub_output)
+                outputs = [output_path / sub.name for sub in subprojects]
+                if len(subprojects) == 1:
+                    print(f"\n=== Analyzing subproject: {subprojects[0]} ===")
+                    project_structure = _analyze_one(subprojects[0], outputs[0], enable_complexity)
+                    self._print_summary(project_structure, outputs[0])
+                else:
+                    # Subprojects are independent; analyze them in separate processes
+                    cpus = os.cpu_count() or 1
+                    outer_workers = min(len(subprojects), cpus)
+                    with ProcessPoolExecutor(max_workers=outer_workers, initializer=_init_subproject_worker) as ex:
+                        futures = {}
+                        for sub, sub_output in zip(subprojects, outputs):
+                            print(f"=== Analyzing subproject: {sub} ===")
+                            futures[ex.submit(_analyze_one, sub, sub_output, enable_complexity)] = sub_output
+                        for future in as_completed(futures):
+                            self._print_summary(future.result(), futures[future])
                 print(f"\n🎉 All subproject analyses saved to: {output_path}")
                 return
             # Initialize analyzer
             analyzer = CodeAnalyzer(str(project_path))
-            # Perform analysis
-            project_structure = analyzer.analyze_project(enable_complexity=enable_complexity)
-            # Generate documentation
-            doc_generator = DocumentationGenerator(project_structure, output_path)
-            doc_generator.generate_all()
+            # One stat per file for all cached tools of this run
+            with stat_snapshot():
+                # Perform analysis
+                project_structure = analyzer.analyze_project(enable_complexity=enable_complexity)
+                # Generate documentation
+                doc_generator = DocumentationGenerator(project_structure, output_path)
+                doc_generator.generate_all()
             # Print summary
             self._print_summary(project_structure, output_path)
         except Exception as e:
@@ -1,23 +1,42 @@
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Iterator
 
-def summarize_file(file_path: Path, max_lines: int = 20) -> str:
-    """
-    تلخيص ملف نصي: أول وأسطر أخيرة + أسماء الدوال والكلاسات (للمعاينة السريعة)
-    """
-    lines = file_path.read_text(encoding='utf-8', errors='ignore').splitlines()
-    summary = []
-    if len(lines) <= max_lines:
-        return '\n'.join(lines)
+# بدايات أسطر تعريف الدوال والكلاسات
+_DEF_PREFIXES = ('def ', 'class ', 'async def ')
+
+def _summarize_lines(lines: Iterator[str], max_lines: int) -> str:
+    head = list(islice(lines, max(max_lines + 1, 5)))
+    if len(head) <= max_lines:
+        return '\n'.join(head)
+    # أسماء الدوال والكلاسات
+    defs = [f"[{i+1}] {line.strip()}" for i, line in enumerate(head) if line.lstrip().startswith(_DEF_PREFIXES)]
+    tail = deque(head, maxlen=5)
+    for i, line in enumerate(lines, start=len(head)):
+        if line.lstrip().startswith(_DEF_PREFIXES):
+            defs.append(f"[{i+1}] {line.strip()}")
+        tail.append(line)
     # أول 5 أسطر
-    summary.extend(lines[:5])
+    summary = head[:5]
     summary.append('...')
-    # أسماء الدوال والكلاسات
-    import re
-    for i, line in enumerate(lines):
-        if re.match(r'\s*def |\s*class ', line):
-            summary.append(f"[{i+1}] {line.strip()}")
+    summary.extend(defs)
     summary.append('...')
     # آخر 5 أسطر
-    summary.extend(lines[-5:])
-    return '\n'.join(summary) 
\ No newline at end of file
+    summary.extend(tail)
+    return '\n'.join(summary)
+
+def summarize_file(file_path: Path, max_lines: int = 20) -> str:
+    """
+    تلخيص ملف نصي: أول وأسطر أخيرة + أسماء الدوال والكلاسات (للمعاينة السريعة)
+    """
+    with open(file_path, encoding='utf-8', errors='ignore') as fh:
+        # قراءة الملف سطرًا سطرًا بدل تحميله كاملًا؛ splitlines على كل سطر تفصل أيضًا عند \f و\v وغيرها
+        # فتبقى الأسطر وأرقامها كما في read_text().splitlines()
+        return _summarize_lines((line for chunk in fh for line in chunk.splitlines()), max_lines)
+
+def summarize_source(source: bytes, max_lines: int = 20) -> str:
+    """
+    تلخيص محتوى ملف مقروء مسبقًا، بنفس نتيجة summarize_file على الملف نفسه
+    """
+    return _summarize_lines(iter(source.decode('utf-8', errors='ignore').splitlines()), max_lines)
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+import xml.etree.ElementTree as StdET
+from pathlib import Path
+from unittest import mock
+
+import coverage_support
+from coverage_support import get_overall_coverage, parse_coverage_xml
+
+# Cobertura layout as written by coverage.py: method <lines> nested inside <class> must not be counted
+REPORT = '''<?xml version="1.0" ?>
+<coverage line-rate="0.5">
+    <sources><source>/src</source></sources>
+    <packages>
+        <package name="pkg">
+            <classes>
+                <class name="a.py" filename="pkg/a.py">
+                    <methods>
+                        <method name="f"><lines><line number="2" hits="0"/></lines></method>
+                    </methods>
+                    <lines>
+                        <line number="1" hits="1"/>
+                        <line number="2" hits="0"/>
+                        <line number="3" hits="12"/>
+                        <line number="4" hits="1" branch="true" condition-coverage="50% (1/2)"/>
+                    </lines>
+                </class>
+                <class name="empty.py" filename="pkg/empty.py">
+                    <methods/>
+                    <lines/>
+                </class>
+                <class name="no_lines.py" filename="pkg/no_lines.py"/>
+            </classes>
+        </package>
+        <package name="other">
+            <classes>
+                <class name="b.py" filename="other/b.py">
+                    <lines><line number="1" hits="0"/><line number="2" hits="0"/></lines>
+                </class>
+            </classes>
+        </package>
+    </packages>
+</coverage>
+'''
+
+EXPECTED = {'pkg/a.py': 75.0, 'pkg/empty.py': 0.0, 'other/b.py': 0.0}
+
+class ParseCoverageXmlTest(unittest.TestCase):
+    """Streaming parse of coverage.xml, with lxml's tag filter and with the stdlib fallback"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.report = Path(self._tmp.name) / 'coverage.xml'
+        self.report.write_text(REPORT, encoding='utf-8')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @unittest.skipUnless(coverage_support._HAVE_LXML, 'lxml is not installed')
+    def test_lxml_class_tag_filter(self):
+        self.assertEqual(coverage_support._ITERPARSE_OPTIONS, {'tag': 'class'})
+        self.assertEqual(parse_coverage_xml(self.report), EXPECTED)
+
+    @unittest.skipUnless(coverage_support._HAVE_LXML, 'lxml is not installed')
+    def test_lxml_python_tally(self):
+        with mock.patch.object(coverage_support, '_select_tally', return_value=coverage_support._tally_lines):
+            self.assertEqual(parse_coverage_xml(self.report), EXPECTED)
+
+    def test_stdlib_fallback(self):
+        with mock.patch.multiple(coverage_support, ET=StdET, _HAVE_LXML=False, _ITERPARSE_OPTIONS={}):
+            self.assertIs(coverage_support._select_tally(), coverage_support._tally_lines)
+            self.assertEqual(parse_coverage_xml(self.report), EXPECTED)
+
+    def test_missing_report(self):
+        self.assertIsNone(parse_coverage_xml(Path(self._tmp.name) / 'missing.xml'))
+
+    def test_overall_coverage(self):
+        self.assertEqual(get_overall_coverage(EXPECTED), 25.0)
+        self.assertEqual(get_overall_coverage({}), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import framework_detection_support
+from analysis_cache import Corpus
+from framework_detection_support import FRAMEWORK_HINTS, detect_frameworks
+
+SAMPLES = {
+    'vue_class.js': "import Vue from 'vue-class-component'\n",
+    'vue.js': "import { createApp } from 'vue'\n",
+    'django_upper.py': 'IMPORT DJANGO\n',
+    'flask.py': 'from flask import Flask\n',
+    'react.jsx': "import React from 'react'\n",
+    'symfony.php': '<?php\nuse Symfony\\Component\\HttpFoundation\\Request;\n',
+    'laravel.php': '<?php\nnamespace App\\Http;\n',
+    'express.js': "const app = require(\"express\")()\n",
+}
+
+def _reference_detect(contents):
+    """Detection as originally written: every hint searched in the lowercased file text"""
+    found = set()
+    for content in contents:
+        lowered = content.lower()
+        for fw, patterns in FRAMEWORK_HINTS.items():
+            if any(re.search(pat, lowered) for pat in patterns):
+                found.add(fw)
+    return found
+
+class DetectFrameworksCaseTest(unittest.TestCase):
+    """The combined pattern must keep the case rules of matching against lowercased text"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.paths = []
+        for name, content in SAMPLES.items():
+            path = self.root / name
+            path.write_text(content, encoding='utf-8')
+            self.paths.append(path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _check(self):
+        corpus = Corpus({path: path.read_bytes() for path in self.paths})
+        for path in self.paths:
+            expected = _reference_detect([SAMPLES[path.name]])
+            with self.subTest(file=path.name):
+                self.assertEqual(detect_frameworks([path]), expected)
+                self.assertEqual(detect_frameworks(Corpus({path: path.read_bytes()})), expected)
+        self.assertEqual(detect_frameworks(corpus), _reference_detect(SAMPLES.values()))
+
+    def test_mixed_case_hints_do_not_match(self):
+        self.assertEqual(detect_frameworks([self.root / 'vue_class.js']), set())
+        corpus = Corpus({path: path.read_bytes() for path in self.paths})
+        self.assertNotIn('symfony', detect_frameworks(corpus))
+        self.assertNotIn('laravel', detect_frameworks(corpus))
+
+    def test_lowercase_hints_ignore_case(self):
+        self.assertEqual(detect_frameworks([self.root / 'django_upper.py']), {'django'})
+
+    def test_regex_path_matches_reference(self):
+        with mock.patch.object(framework_detection_support, '_hs_db', None):
+            self._check()
+
+    @unittest.skipIf(framework_detection_support._hs_db is None, 'hyperscan is not installed')
+    def test_hyperscan_path_matches_reference(self):
+        self._check()
+
+if __name__ == '__main__':
+    unittest.main()
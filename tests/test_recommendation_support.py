@@ -0,0 +1,60 @@
+import unittest
+
+from recommendation_support import (
+    DEFAULT_THRESHOLDS, compile_recommendation_engine, generate_recommendations, iter_recommendations,
+)
+
+COMPLEX = "الكود معقد جدًا في بعض الملفات، يُنصح بتقسيمها أو إعادة هيكلتها."
+LARGE = "المشروع كبير جدًا، فكر في تقسيمه إلى وحدات أو حزم أصغر."
+LINT = "هناك العديد من مشاكل linting، يُنصح بتحسين جودة الكود."
+DENSE = "هناك كثافة دوال عالية في بعض الملفات، فكر في توزيع الوظائف."
+GOOD = "الكود منظم وجيد، استمر في العمل الجيد!"
+
+def coverage_message(threshold):
+    return f"تغطية الاختبارات أقل من {threshold}%، يُنصح بزيادة الاختبارات."
+
+class RecommendationRulesTest(unittest.TestCase):
+    """Rule table results, in rule order, for the default and custom thresholds"""
+
+    def test_clean_project_gets_default_message(self):
+        metrics = {'average_complexity': 2, 'total_lines': 500, 'total_functions': 20, 'total_files': 10}
+        self.assertEqual(generate_recommendations(metrics, coverage=90, lint_issues=3), [GOOD])
+        self.assertEqual(list(iter_recommendations(metrics, 90, 3)), [GOOD])
+
+    def test_every_rule_fires_in_order(self):
+        metrics = {'average_complexity': 11, 'total_lines': 10001, 'total_functions': 110, 'total_files': 10}
+        expected = [COMPLEX, LARGE, coverage_message(60), LINT, DENSE]
+        self.assertEqual(generate_recommendations(metrics, coverage=59.9, lint_issues=21), expected)
+        self.assertEqual(list(iter_recommendations(metrics, 59.9, 21)), expected)
+
+    def test_thresholds_are_strict(self):
+        metrics = {'average_complexity': 10, 'total_lines': 10000, 'total_functions': 100, 'total_files': 10}
+        self.assertEqual(generate_recommendations(metrics, coverage=60, lint_issues=20), [GOOD])
+
+    def test_missing_coverage_and_lint_are_skipped(self):
+        self.assertEqual(generate_recommendations({}), [GOOD])
+        # No files: the function density divides by one instead of zero
+        self.assertEqual(generate_recommendations({'total_functions': 11, 'total_files': 0}), [DENSE])
+
+    def test_custom_thresholds_merge_with_defaults(self):
+        config = {'min_coverage': 80, 'max_lint_issues': 100}
+        engine = compile_recommendation_engine(config)
+        metrics = {'average_complexity': 11}
+        expected = [COMPLEX, coverage_message(80)]
+        self.assertEqual(engine(metrics, 70, 50), expected)
+        self.assertEqual(list(iter_recommendations(metrics, 70, 50, config=config)), expected)
+        self.assertEqual(DEFAULT_THRESHOLDS['min_coverage'], 60)
+
+    def test_engine_is_reused_per_config(self):
+        self.assertIs(compile_recommendation_engine({'min_coverage': 80}),
+                      compile_recommendation_engine({'min_coverage': 80}))
+        self.assertIs(compile_recommendation_engine(), compile_recommendation_engine({}))
+
+    def test_iter_recommendations_is_lazy(self):
+        recs = iter_recommendations({'average_complexity': 11, 'total_lines': 10001})
+        self.assertEqual(next(recs), COMPLEX)
+        self.assertEqual(next(recs), LARGE)
+        self.assertRaises(StopIteration, next, recs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import cache_support
+from security_support import analyze_security_with_bandit
+
+try:
+    import bandit
+except ImportError:
+    bandit = None
+
+SOURCES = {
+    'from_import.py': 'from os import system\n\ndef run(x):\n    system("ls " + x)\n',
+    'aliased.py': 'import os as o\n\ndef run(x):\n    o.system("ls " + x)\n',
+}
+
+@unittest.skipIf(bandit is None, 'bandit غير مثبت')
+class BanditSinksTest(unittest.TestCase):
+    """
+    bandit يتتبع الأسماء المستوردة والأسماء المستعارة، فيجب أن تصل هذه الملفات إليه وتظهر نتائجها
+    """
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        cache_support._cache = None  # قاعدة بيانات مؤقتة جديدة داخل المجلد المؤقت
+        self.files = []
+        for name, source in SOURCES.items():
+            path = Path(self._tmp.name) / name
+            path.write_text(source, encoding='utf-8')
+            self.files.append(path)
+
+    def tearDown(self):
+        if cache_support._cache is not None:
+            cache_support._cache.conn.close()
+        cache_support._cache = None
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def assert_b605(self, results):
+        for path in self.files:
+            test_ids = {issue['test_id'] for issue in results.get(str(path), [])}
+            self.assertIn('B605', test_ids, path.name)
+
+    def test_from_imported_and_aliased_sinks(self):
+        self.assert_b605(analyze_security_with_bandit(self.files))
+
+    def test_cached_results_keep_findings(self):
+        analyze_security_with_bandit(self.files)
+        self.assert_b605(analyze_security_with_bandit(self.files))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import cache_support
+from smartrepo_analyzer import CodeAnalyzer
+
+class AnalyzeFileCacheTest(unittest.TestCase):
+    """Per-file analysis results must be committed to the sqlite cache by analyze_project"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project = Path(self._tmp.name)
+        os.chdir(self.project)
+        cache_support._cache = None  # fresh cache database inside the temporary project
+        # Go sources: no external linter or other cached tool runs (and commits) after the file analysis
+        (self.project / 'main.go').write_text(
+            'package main\n\nimport "fmt"\n\nfunc main() {\n\tfmt.Println(helper())\n}\n', encoding='utf-8')
+        (self.project / 'util.go').write_text('package main\n\nfunc helper() int {\n\treturn 1\n}\n', encoding='utf-8')
+
+    def tearDown(self):
+        if cache_support._cache is not None:
+            cache_support._cache.conn.close()
+        cache_support._cache = None
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_rows_persist_after_analyze_project(self):
+        with redirect_stdout(io.StringIO()):
+            CodeAnalyzer(str(self.project)).analyze_project()
+        cache = cache_support.get_cache()
+        self.assertFalse(cache.conn.in_transaction)
+        # A separate connection only sees committed rows
+        cache.conn.close()
+        cache_support._cache = None
+        rows = cache_support.get_cache().conn.execute(
+            "SELECT path FROM results WHERE tool LIKE 'analyze_file%'").fetchall()
+        self.assertEqual(sorted(Path(path).name for (path,) in rows), ['main.go', 'util.go'])
+
+class LazyImportTest(unittest.TestCase):
+    """Importing the CLI module must not pay for analysis-only start-up work"""
+
+    def test_import_skips_numba_and_hyperscan_compile(self):
+        # A fresh interpreter: other tests in this process may already have imported numba
+        probe = ('import sys, smartrepo_analyzer as m; '
+                 'print("numba" in sys.modules, m._js_hs_database.cache_info().currsize, '
+                 'm._metrics_reducer.cache_info().currsize)')
+        out = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True,
+                             cwd=Path(__file__).resolve().parent.parent).stdout.split()
+        self.assertEqual(out, ['False', '0', '0'])
+
+if __name__ == '__main__':
+    unittest.main()
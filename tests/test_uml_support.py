@@ -0,0 +1,97 @@
+import ast
+import tempfile
+import unittest
+from pathlib import Path
+
+from uml_support import _base_name, collect_classes, generate_mermaid_class_diagram
+
+SOURCE = '''
+import torch.nn as nn
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+class Model(nn.Module):
+    class Config:
+        pass
+
+class Box(Generic[T], object):
+    pass
+
+def factory():
+    class Local(Model):
+        pass
+    return Local
+
+if True:
+    class Guarded(torch.nn.Module, make_base()):
+        pass
+
+try:
+    import fast
+except ImportError:
+    class Fallback:
+        pass
+'''
+
+def _base(expr):
+    return _base_name(ast.parse(expr, mode='eval').body)
+
+class BaseNameTest(unittest.TestCase):
+    """Base class expressions as written: names and dotted attributes, nothing else"""
+
+    def test_name_and_attribute_chains(self):
+        self.assertEqual(_base('object'), 'object')
+        self.assertEqual(_base('nn.Module'), 'nn.Module')
+        self.assertEqual(_base('torch.nn.Module'), 'torch.nn.Module')
+
+    def test_other_expressions(self):
+        self.assertIsNone(_base('Generic[T]'))
+        self.assertIsNone(_base('make_base()'))
+        self.assertIsNone(_base('make_base().Module'))
+
+class CollectClassesTest(unittest.TestCase):
+
+    def test_matches_ast_walk_order(self):
+        tree = ast.parse(SOURCE)
+        expected = [(node.name, [name for name in map(_base_name, node.bases) if name])
+                    for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+        self.assertEqual(collect_classes(tree), expected)
+        self.assertEqual([name for name, _ in expected],
+                         ['Model', 'Box', 'Config', 'Local', 'Guarded', 'Fallback'])
+
+class MermaidClassDiagramTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output = Path(self._tmp.name) / 'uml-class-diagram.mmd'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_dotted_bases_and_duplicates(self):
+        classes = [
+            ('Model', ['nn.Module']),
+            ('Box', ['object']),
+            # Same class name in another file: one node, and its edges are not repeated
+            ('Model', ['nn.Module', 'Base']),
+            ('Child', ['Model', 'Model']),
+        ]
+        generate_mermaid_class_diagram(classes, self.output)
+        self.assertEqual(self.output.read_text(encoding='utf-8'), (
+            "classDiagram"
+            "\n    class Model"
+            "\n    `nn.Module` <|-- Model"
+            "\n    class Box"
+            "\n    object <|-- Box"
+            "\n    Base <|-- Model"
+            "\n    class Child"
+            "\n    Model <|-- Child"
+        ))
+
+    def test_empty(self):
+        generate_mermaid_class_diagram([], self.output)
+        self.assertEqual(self.output.read_text(encoding='utf-8'), "classDiagram")
+
+if __name__ == '__main__':
+    unittest.main()
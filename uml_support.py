@@ -1,25 +1,76 @@
 import ast
 from pathlib import Path
-from typing import List
-
-def generate_mermaid_class_diagram(py_files: List[Path], output_path: Path):
-    """
-    توليد مخطط Mermaid class diagram من ملفات Python
-    """
-    classes = []
-    for file in py_files:
-        try:
-            tree = ast.parse(file.read_text(encoding='utf-8'))
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    bases = [b.id if isinstance(b, ast.Name) else '' for b in node.bases]
-                    classes.append((node.name, bases))
-        except Exception:
-            continue
-    lines = ["classDiagram"]
-    for cls, bases in classes:
-        lines.append(f"    class {cls}")
-        for base in bases:
-            if base:
-                lines.append(f"    {base} <|-- {cls}")
-    output_path.write_text('\n'.join(lines), encoding='utf-8') 
\ No newline at end of file
+from typing import Iterable, List, Optional, Tuple
+
+def _base_name(base: ast.expr) -> Optional[str]:
+    """
+    اسم الصنف الأب كما كُتب (Name أو سلسلة Attribute مثل nn.Module)، أو None لبقية التعبيرات
+    """
+    parts = []
+    while isinstance(base, ast.Attribute):
+        parts.append(base.attr)
+        base = base.value
+    if not isinstance(base, ast.Name):
+        return None
+    parts.append(base.id)
+    return '.'.join(reversed(parts))
+
+def _mermaid_name(name: str) -> str:
+    # Mermaid لا يقبل النقطة في اسم الكلاس إلا بين علامتي `
+    return f"`{name}`" if '.' in name else name
+
+class ClassCollector(ast.NodeVisitor):
+    """
+    جمع تعريفات الكلاسات مع المرور على الجمل فقط، لأن الكلاس لا يمكن أن يظهر داخل تعبير
+    """
+    _CONTAINERS = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, 'match_case') else ())
+
+    def __init__(self):
+        self.classes = []  # (العمق، الاسم، الأصناف الأب)
+        self._depth = 0
+
+    def generic_visit(self, node):
+        self._depth += 1
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, self._CONTAINERS):
+                self.visit(child)
+        self._depth -= 1
+
+    def visit_ClassDef(self, node):
+        bases = [name for name in map(_base_name, node.bases) if name]
+        self.classes.append((self._depth, node.name, bases))
+        self.generic_visit(node)
+
+    def ordered(self) -> List[Tuple[str, List[str]]]:
+        # الترتيب الثابت حسب العمق يعيد نفس ترتيب ast.walk (بحث بالعرض)
+        return [(name, bases) for _, name, bases in sorted(self.classes, key=lambda c: c[0])]
+
+def collect_classes(tree: ast.AST) -> List[Tuple[str, List[str]]]:
+    """
+    إرجاع (اسم الكلاس، الأصناف الأب) لكل كلاس في شجرة AST بنفس ترتيب ast.walk
+    """
+    collector = ClassCollector()
+    try:
+        collector.visit(tree)
+    except RecursionError:
+        return []
+    return collector.ordered()
+
+def generate_mermaid_class_diagram(classes: Iterable[Tuple[str, List[str]]], output_path: Path):
+    """
+    توليد مخطط Mermaid class diagram من الكلاسات التي جمعتها collect_classes
+    """
+    # الكتابة سطرًا بسطر عبر مخزن 1MB بدل بناء قائمة ثم دمجها (بدون سطر جديد في النهاية كما سبق)
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as out:
+        out.write("classDiagram")
+        # Mermaid يدمج الكلاسات ذات الاسم الواحد، فالتكرار (كلاسات بنفس الاسم في ملفات مختلفة) لا يضيف شيئًا
+        seen_classes = set()
+        seen_edges = set()
+        for cls, bases in classes:
+            if cls not in seen_classes:
+                seen_classes.add(cls)
+                out.write(f"\n    class {cls}")
+            for base in bases:
+                if base and (base, cls) not in seen_edges:
+                    seen_edges.add((base, cls))
+                    out.write(f"\n    {_mermaid_name(base)} <|-- {cls}")
@@ -1,24 +1,59 @@
 import ast
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-def extract_usage_examples(py_files: List[Path]) -> List[str]:
+def _raw_docstring(node: ast.AST) -> Optional[str]:
     """
-    استخراج أمثلة استخدام من ملفات Python (من دوال test_ أو docstrings)
+    نص docstring كما هو في الشجرة بدون تنظيف المسافات الذي تجريه ast.get_docstring
     """
-    examples = []
-    for file in py_files:
-        try:
-            tree = ast.parse(file.read_text(encoding='utf-8'))
-            for node in ast.walk(tree):
-                # أمثلة من دوال test_
-                if isinstance(node, ast.FunctionDef) and node.name.startswith('test_'):
-                    examples.append(f"من {file.name}: {node.name}() -> {ast.get_docstring(node) or ''}")
-                # أمثلة من docstring للكلاس أو الدالة
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    doc = ast.get_docstring(node)
-                    if doc and 'example' in doc.lower():
-                        examples.append(f"من {file.name}: {node.name} -> {doc}")
-        except Exception:
-            continue
-    return examples 
\ No newline at end of file
+    first = node.body[0] if node.body else None
+    if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+        return first.value.value
+    return None
+
+class UsageCollector(ast.NodeVisitor):
+    """
+    جمع أمثلة الاستخدام من تعريفات الدوال والكلاسات مع المرور على الجمل فقط
+    """
+    _CONTAINERS = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, 'match_case') else ())
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.examples = []  # (العمق، المثال)
+        self._depth = 0
+
+    def generic_visit(self, node):
+        self._depth += 1
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, self._CONTAINERS):
+                self.visit(child)
+        self._depth -= 1
+
+    def visit_FunctionDef(self, node):
+        # أمثلة من دوال test_
+        if node.name.startswith('test_'):
+            self.examples.append((self._depth, f"من {self.file_name}: {node.name}() -> {ast.get_docstring(node) or ''}"))
+        self.visit_ClassDef(node)
+
+    def visit_ClassDef(self, node):
+        # أمثلة من docstring للكلاس أو الدالة
+        # التنظيف يحذف مسافات فقط، فوجود 'example' في النص الخام يكفي لتقرير النتيجة
+        raw = _raw_docstring(node)
+        if raw and 'example' in raw.lower():
+            self.examples.append((self._depth, f"من {self.file_name}: {node.name} -> {ast.get_docstring(node)}"))
+        self.generic_visit(node)
+
+    def ordered(self) -> List[str]:
+        # الترتيب الثابت حسب العمق يعيد نفس ترتيب ast.walk (بحث بالعرض)
+        return [example for _, example in sorted(self.examples, key=lambda e: e[0])]
+
+def extract_usage_examples(file: Path, tree: ast.AST) -> List[str]:
+    """
+    استخراج أمثلة استخدام من شجرة AST لملف Python (من دوال test_ أو docstrings)
+    """
+    collector = UsageCollector(file.name)
+    try:
+        collector.visit(tree)
+    except RecursionError:
+        return []
+    return collector.ordered()